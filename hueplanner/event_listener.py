@@ -22,6 +22,7 @@ class HueEventStreamListener:
     def __init__(self, bridge_v2: HueBridgeV2) -> None:
         self.bridge_v2 = bridge_v2
         self._handlers: list[EventHandler] = []
+        self._retry_counter = 0
 
     async def _handle_event(self, event: HueEvent):
         for handler in self._handlers:
@@ -41,38 +42,45 @@ class HueEventStreamListener:
         # logger.info("Event listener registered to HueEventStreamListener", check=check, handle=handle)
         self._handlers.append(EventHandler(check, handle))
 
+    async def _consume(self, event_stream: HueEventStream):
+        async with event_stream as events:
+            logger.warning("HueEventStream connected")
+            # Reset the retry counter on successful connection
+            self._retry_counter = 0
+            async for event in events:
+                # self.task_pool.add(self._handle_event(event))
+                await self._handle_event(event)
+
     async def run(self, stop_event: asyncio.Event):
         logger.debug("Reliable HUE event stream listener started")
-        while not stop_event.is_set():
-            event_stream: HueEventStream = self.bridge_v2.event_stream()
-
-            async def terminate():
-                await stop_event.wait()
-                logger.info("Terminating event listener")
-                await event_stream.close()
-
-            terminate_task = asyncio.create_task(terminate())
-
-            try:
-                async with event_stream as events:
-                    logger.warning("HueEventStream connected")
-                    # Reset the retry counter on successful connection
-                    retry_counter = 0
-                    async for event in events:
-                        # self.task_pool.add(self._handle_event(event))
-                        await self._handle_event(event)
-            except Exception:
-                logger.exception("Event stream closed with error")
-                terminate_task.cancel()
-                with suppress(asyncio.CancelledError):
-                    await terminate_task
+        self._retry_counter = 0
+        # Single stop waiter for all reconnect iterations, also interrupts the reconnect backoff
+        stop_waiter = asyncio.create_task(stop_event.wait())
+        stream_task: asyncio.Task | None = None
+        try:
+            while not stop_event.is_set():
+                stream_task = asyncio.create_task(self._consume(self.bridge_v2.event_stream()))
+                await asyncio.wait((stream_task, stop_waiter), return_when=asyncio.FIRST_COMPLETED)
+                if not stream_task.done():
+                    logger.info("Terminating event listener")
+                    break
+
+                if exception := stream_task.exception():
+                    logger.error("Event stream closed with error", exc_info=exception)
+                else:
+                    logger.warning("Event stream closed")
 
                 # Calculate backoff time
-                backoff_time = min(2**retry_counter, 120)  # Exponential backoff with a cap
+                backoff_time = min(2**self._retry_counter, 120)  # Exponential backoff with a cap
                 logger.info(f"Reconnecting to event stream in {backoff_time} seconds.")
-                await asyncio.sleep(backoff_time)
-                retry_counter += 1  # Increment the retry counter after failure
-                continue
-
-            await terminate_task
+                self._retry_counter += 1  # Increment the retry counter after failure
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(asyncio.shield(stop_waiter), backoff_time)
+        finally:
+            if stream_task is not None and not stream_task.done():
+                # Cancelling closes the stream on the way out of its context manager
+                stream_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await stream_task
+            stop_waiter.cancel()
         logger.info("Exited event listener reliable loop")
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Any
 
 # TODO: Make full schema for this one
@@ -9,3 +10,16 @@ HueEventData = dict[str, Any]
 class HueEvent:
     id: str
     data: list[HueEventData]
+
+    @cached_property
+    def indexed(self) -> dict[tuple[str, str | None], list[HueEventData]]:
+        """Inner event items grouped by (type, id), and by (type, None) for all items of a type.
+
+        Built once per event and shared between all triggers checking it.
+        """
+        index: dict[tuple[str, str | None], list[HueEventData]] = {}
+        for event in self.data:
+            for item in event["data"]:
+                index.setdefault((item["type"], item["id"]), []).append(item)
+                index.setdefault((item["type"], None), []).append(item)
+        return index
@@ -1,16 +1,117 @@
+import atexit
 import logging
 import logging.config
+import queue
+import sys
+import threading
+import traceback
+from typing import Any, Callable, TextIO
 
 import structlog
+from structlog.typing import EventDict
+
+
+# Minimal levels for own modules, applied on top of the global level
+MODULE_LOG_LEVELS = {
+    "hueplanner.ioc": logging.ERROR,
+}
+
+
+class _NamedWriteLogger(structlog.WriteLogger):
+    """WriteLogger carrying the name it was requested with, for `structlog.stdlib.add_logger_name`."""
+
+    def __init__(self, name: str, file: TextIO | None = None) -> None:
+        super().__init__(file)
+        self.name = name
+
+
+class QueuedStream:
+    """Text stream handing writes over to a background thread, so logging never blocks the event loop on I/O."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self._queue: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, text: str) -> int:
+        self._queue.put(text)
+        return len(text)
+
+    def flush(self) -> None:
+        # Flushed by the writer thread whenever it drains the queue
+        pass
+
+    def isatty(self) -> bool:
+        return self._stream.isatty()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while (text := self._queue.get()) is not None:
+            try:
+                self._stream.write(text)
+                if self._queue.empty():
+                    self._stream.flush()
+            except Exception:
+                # Same as logging.Handler.handleError: report and drop the record, but keep draining the queue
+                self._report_error()
+        try:
+            self._stream.flush()
+        except Exception:
+            self._report_error()
+
+    def _report_error(self) -> None:
+        try:
+            traceback.print_exc(file=sys.__stderr__)
+        except Exception:
+            pass
+
+
+_log_stream: QueuedStream | None = None
+
+
+def _make_logger_factory(stream: TextIO) -> Callable[..., _NamedWriteLogger]:
+    def logger_factory(*args: Any) -> _NamedWriteLogger:
+        return _NamedWriteLogger(args[0] if args else "", stream)
+
+    return logger_factory
+
+
+def _module_min_level(name: str) -> int | None:
+    # Like the standard logging hierarchy, a module level also applies to its child loggers
+    for module, level in MODULE_LOG_LEVELS.items():
+        if name == module or name.startswith(module + "."):
+            return level
+    return None
+
+
+def _filter_by_module_level(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+    min_level = _module_min_level(event_dict.get("logger", ""))
+    if min_level is not None and structlog.stdlib.NAME_TO_LEVEL.get(method_name, logging.NOTSET) < min_level:
+        raise structlog.DropEvent
+    return event_dict
 
 
 def configure_logging(log_level="info", console_colors=True):
+    global _log_stream
+    if _log_stream is None:
+        # Reused on reconfiguration, since loggers cached on first use keep writing to it
+        _log_stream = QueuedStream(sys.stderr)
+        # Write out whatever is still queued on interpreter exit
+        atexit.register(_log_stream.close)
+
     timestamper = structlog.processors.TimeStamper(fmt="iso", utc=True)
-    processor_chain = [
+    naming_processors = [
         # Adding contextvars to support "structlog.contextvars.bind_contextvars"
         structlog.contextvars.merge_contextvars,
         # Adding logger name
         structlog.stdlib.add_logger_name,
+    ]
+    formatting_processors = [
         # Adding log level
         structlog.stdlib.add_log_level,
         # Adding timestamp
@@ -22,45 +123,54 @@ def configure_logging(log_level="info", console_colors=True):
         structlog.processors.format_exc_info,
     ]
     external_logger_processors = [
-        *processor_chain,
+        *naming_processors,
+        *formatting_processors,
         # Here you can add processors for external library loggers
     ]
+    renderer = structlog.dev.ConsoleRenderer(colors=console_colors)
+    # For full-json logging replace this with:
+    # renderer = structlog.processors.JSONRenderer()
     structlog_processors = [
-        # This will filter structlog records by level before passing it to other processors
-        structlog.stdlib.filter_by_level,
-        *processor_chain,
-        # Required to actually print log records from structlog loggers into logging
-        structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        *naming_processors,
+        # Dropped as soon as the logger name is known, before any formatting work
+        _filter_by_module_level,
+        *formatting_processors,
+        renderer,
     ]
 
+    # Only external libraries log through the standard logging module
     logging_config = {
         "version": 1,
         "disable_existing_loggers": False,
         "formatters": {
             "default": {
                 "()": structlog.stdlib.ProcessorFormatter,
-                "processor": structlog.dev.ConsoleRenderer(colors=console_colors),
-                # For full-json logging replace this with:
-                # "processor": structlog.processors.JSONRenderer(),
+                "processor": renderer,
                 "foreign_pre_chain": external_logger_processors,
             },
         },
         "handlers": {
-            "default": {"level": log_level.upper(), "class": "logging.StreamHandler", "formatter": "default"},
+            "default": {
+                "level": log_level.upper(),
+                "class": "logging.StreamHandler",
+                "formatter": "default",
+                "stream": _log_stream,
+            },
         },
         "loggers": {
             "": {"level": log_level.upper(), "handlers": ["default"], "propagate": True},
             "aiosqlite": {"level": "ERROR", "handlers": ["default"], "propagate": False},  # Filter for aiosqlite
-            "hueplanner.ioc": {"level": "ERROR", "handlers": ["default"], "propagate": False},  # Filter for ioc
         },
     }
 
     logging.config.dictConfig(logging_config)
+    # Own loggers bypass the standard logging module: level filtering is compiled into the bound logger
+    # methods (calls below the level are no-ops) and rendered lines go straight to the queued stderr.
     structlog.configure(
         processors=structlog_processors,
         context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,  # noqa
+        logger_factory=_make_logger_factory(_log_stream),
+        wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(log_level.upper())),
         cache_logger_on_first_use=True,
     )
 
@@ -8,14 +8,19 @@ class PlanActionCallback(PlanAction):
     def __init__(self, callback: Callable[..., None] | Callable[..., Awaitable[None]], *args, **kwargs) -> None:
         super().__init__()
         self._callback = callback
+        self._is_async = inspect.iscoroutinefunction(callback)
         self._args = args
         self._kwargs = kwargs
 
     async def define_action(self) -> EvaluatedAction:
-        async def action():
-            if inspect.iscoroutinefunction(self._callback):
+        if self._is_async:
+
+            async def action():
                 await self._callback(*self._args, **self._kwargs)  # Await if it's awaitable
-            else:
+
+        else:
+
+            async def action():
                 self._callback(*self._args, **self._kwargs)  # Call directly if it's not awaitable
 
         return action
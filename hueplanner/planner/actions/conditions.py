@@ -3,14 +3,40 @@ from __future__ import annotations
 import structlog
 
 from hueplanner.ioc import IOC
-from hueplanner.planner.conditions import PlanCondition
+from hueplanner.planner.conditions import EvaluatedCondition, PlanCondition
 
 from .interface import EvaluatedAction, PlanAction
 
 logger = structlog.getLogger(__name__)
 
 
+class _RunIfAction:
+    __slots__ = ("_condition", "_evaluated_condition", "_action", "_ioc")
+
+    def __init__(
+        self,
+        condition: PlanCondition,
+        evaluated_condition: EvaluatedCondition,
+        action: EvaluatedAction,
+        ioc: IOC,
+    ) -> None:
+        self._condition = condition
+        self._evaluated_condition = evaluated_condition
+        self._action = action
+        self._ioc = ioc
+
+    async def run(self):
+        satisfied = await self._ioc.make(self._evaluated_condition)
+        if satisfied:
+            logger.info("Runtime condition met, executing action", condition=self._condition)
+            return await self._ioc.make(self._action)
+        else:
+            logger.info("Runtime condition is NOT met, action not executed", condition=self._condition)
+
+
 class PlanActionRunIf(PlanAction):
+    __slots__ = ("_action", "_condition")
+
     def __init__(self, condition: PlanCondition, action: PlanAction) -> None:
         super().__init__()
         self._action = action
@@ -19,13 +45,4 @@ class PlanActionRunIf(PlanAction):
     async def define_action(self, ioc: IOC) -> EvaluatedAction:
         _action = await ioc.make(self._action.define_action)
         _condition = await ioc.make(self._condition.define_condition)
-
-        async def action():
-            satisfied = await ioc.make(_condition)
-            if satisfied:
-                logger.info("Runtime condition met, executing action", condition=self._condition)
-                return await ioc.make(_action)
-            else:
-                logger.info("Runtime condition is NOT met, action not executed", condition=self._condition)
-
-        return action
+        return _RunIfAction(self._condition, _condition, _action, ioc).run
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 import structlog
 from pydantic.dataclasses import dataclass
 
@@ -11,11 +13,12 @@ from .interface import EvaluatedAction, PlanAction
 logger = structlog.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanActionPrintSchedule(PlanAction, Serializable):
     async def define_action(self, scheduler: Scheduler) -> EvaluatedAction:
         async def action():
             # logger.info(f"Current schedule: \n{scheduler}")
-            print(f"Current schedule: \n{scheduler}", flush=True)
+            # Schedule is owned by the event loop, so format it here and only offload blocking stdout write
+            await asyncio.to_thread(print, f"Current schedule: \n{scheduler}", flush=True)
 
         return action
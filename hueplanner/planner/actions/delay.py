@@ -11,7 +11,24 @@ from .interface import EvaluatedAction, PlanAction
 logger = structlog.getLogger(__name__)
 
 
+class _DelayedAction:
+    __slots__ = ("_delay", "_action", "_ioc")
+
+    def __init__(self, delay: float, action: EvaluatedAction, ioc: IOC) -> None:
+        self._delay = delay
+        self._action = action
+        self._ioc = ioc
+
+    async def run(self):
+        logger.info(f"Awaiting for delay: {self._delay:.4f}s.")
+        await asyncio.sleep(delay=self._delay)
+        logger.info("Executing action")
+        return await self._ioc.make(self._action)
+
+
 class PlanActionDelayed(PlanAction):
+    __slots__ = ("_action", "_delay")
+
     def __init__(self, delay: float, action: PlanAction) -> None:
         super().__init__()
         self._action = action
@@ -19,11 +36,4 @@ class PlanActionDelayed(PlanAction):
 
     async def define_action(self, ioc: IOC) -> EvaluatedAction:
         _action = await ioc.make(self._action.define_action)
-
-        async def action():
-            logger.info(f"Awaiting for delay: {self._delay:.4f}s.")
-            await asyncio.sleep(delay=self._delay)
-            logger.info("Executing action")
-            return await ioc.make(_action)
-
-        return action
+        return _DelayedAction(self._delay, _action, ioc).run
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from datetime import datetime, time, timedelta, tzinfo
-from typing import Any, Callable
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple
 
 import astral
 import structlog
@@ -14,7 +15,7 @@ from timezonefinder import TimezoneFinder
 
 from hueplanner.ioc import IOC
 from hueplanner.planner.serializable import Serializable
-from hueplanner.storage.interface import IKeyValueStorage
+from hueplanner.storage.interface import IKeyValueCollection, IKeyValueStorage
 
 from .interface import EvaluatedAction, PlanAction
 
@@ -23,10 +24,14 @@ logger = structlog.getLogger(__name__)
 _geolocator = Nominatim(user_agent="hueplanner")
 
 
-@dataclass
-class AstronomicalEvent:
+class AstronomicalEvent(NamedTuple):
     event_func: Callable[[Any, Any, Any], datetime]
     default_time: time
+    # Event is guaranteed to exist for any date below this absolute latitude (None - exists everywhere)
+    polar_latitude: float | None = None
+
+    def always_occurs(self, latitude: float) -> bool:
+        return self.polar_latitude is None or abs(latitude) < self.polar_latitude
 
 
 # Default average times for astronomical events (adjust these as needed)
@@ -39,14 +44,16 @@ DEFAULT_TIMES = {
     "midnight": datetime.strptime("00:00", "%H:%M").time(),
 }
 
+# Civil twilight may be missing above ~60.5° (white nights), sunrise/sunset above ~65.7° (polar day/night)
 ASTRONOMICAL_EVENTS = {
-    "dawn": AstronomicalEvent(dawn, DEFAULT_TIMES["dawn"]),
-    "sunrise": AstronomicalEvent(sunrise, DEFAULT_TIMES["sunrise"]),
+    "dawn": AstronomicalEvent(dawn, DEFAULT_TIMES["dawn"], polar_latitude=60.0),
+    "sunrise": AstronomicalEvent(sunrise, DEFAULT_TIMES["sunrise"], polar_latitude=65.0),
     "noon": AstronomicalEvent(noon, DEFAULT_TIMES["noon"]),
-    "sunset": AstronomicalEvent(sunset, DEFAULT_TIMES["sunset"]),
-    "dusk": AstronomicalEvent(dusk, DEFAULT_TIMES["dusk"]),
+    "sunset": AstronomicalEvent(sunset, DEFAULT_TIMES["sunset"], polar_latitude=65.0),
+    "dusk": AstronomicalEvent(dusk, DEFAULT_TIMES["dusk"], polar_latitude=60.0),
     "midnight": AstronomicalEvent(midnight, DEFAULT_TIMES["midnight"]),
 }
+_EVENT_ITEMS = tuple(ASTRONOMICAL_EVENTS.items())
 
 
 def get_timezone_from_coords(lat, lng):
@@ -94,7 +101,21 @@ def location_from_coords(lat, lng) -> Location:
     )
 
 
+@lru_cache(maxsize=64)
+def _zoneinfo(tz_name: str) -> zoneinfo.ZoneInfo:
+    return zoneinfo.ZoneInfo(tz_name)
+
+
+@lru_cache(maxsize=64)
+def _observer(latitude: float, longitude: float) -> Observer:
+    return Observer(latitude=latitude, longitude=longitude, elevation=0)
+
+
 def calculate_astronomical_event(event: AstronomicalEvent, observer, date, tzinfo) -> datetime:
+    if event.always_occurs(observer.latitude):
+        return event.event_func(observer, date=date, tzinfo=tzinfo)
+
+    # Polar regions: event may not happen at all for the given date
     try:
         return event.event_func(observer, date=date, tzinfo=tzinfo)
     except ValueError:
@@ -114,26 +135,21 @@ def calculate_astronomical_event(event: AstronomicalEvent, observer, date, tzinf
 def astronomical_variables_from_location(location: Location, now: datetime | None = None) -> dict[str, datetime]:
     variables: dict[str, datetime] = {}
     if now is None:
-        now = datetime.now(tz=zoneinfo.ZoneInfo(location.timezone))
-    observer = Observer(latitude=location.latitude, longitude=location.longitude, elevation=0)
+        now = datetime.now(tz=_zoneinfo(location.timezone))
+    observer = _observer(location.latitude, location.longitude)
 
     # Calculate each astronomical event with error handling
-    for event_name, event in ASTRONOMICAL_EVENTS.items():
+    for event_name, event in _EVENT_ITEMS:
         if event_name == "midnight":
-            try:
-                variables[event_name] = event.event_func(observer, date=now, tzinfo=location.timezone) + timedelta(
-                    days=1
-                )
-            except ValueError:
-                logger.warning(f"Failed to calculate {event_name} for {now}")
-                variables[event_name] = datetime.combine(now.date(), event.default_time) + timedelta(days=1)
+            # Solar midnight exists for any latitude, including polar day and polar night
+            variables[event_name] = event.event_func(observer, date=now, tzinfo=location.timezone) + timedelta(days=1)
         else:
             variables[event_name] = calculate_astronomical_event(event, observer, now, location.timezone)
 
     return variables
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class PlanActionPopulateGeoVariables(PlanAction, Serializable):
     variables_db: str = "geo_variables"
     cache_db: str | None = None
@@ -145,6 +161,7 @@ class PlanActionPopulateGeoVariables(PlanAction, Serializable):
     async def define_action(self, storage: IKeyValueStorage, ioc: IOC) -> EvaluatedAction:
         logger.warning("Preparing geo-location for astronomical events calculation")
         location = None
+        cache = None
         if self.cache_db:
             cache = await storage.create_collection(self.cache_db)
             location = await cache.get("location")
@@ -176,19 +193,38 @@ class PlanActionPopulateGeoVariables(PlanAction, Serializable):
             logger.warning("Timezone updated from geolocation", tz=location.tzinfo)
             ioc.declare(tzinfo, location.tzinfo)
 
-        if self.cache_db:
+        if cache is not None:
             await cache.set("location", location)
             logger.info("Location cache updated", location=location)
 
+        variables = await storage.create_collection(self.variables_db)
+
         async def action():
             logger.info("Astronomical events calculation requested", action=repr(self))
-            variables = await storage.create_collection(self.variables_db)
             if (await variables.size()) > 0:
                 await variables.delete_all()
                 logger.warning(f"variables_db {self.variables_db!r} cache flushed")
 
-            for k, v in astronomical_variables_from_location(location).items():
+            for k, v in (await self._calculate_variables(location, cache)).items():
                 logger.info(f"Astronomical event for today: {k:<10}: {str(v)}")
                 await variables.set(k, v)
 
         return action
+
+    @staticmethod
+    async def _calculate_variables(location: Location, cache: IKeyValueCollection | None) -> dict[str, datetime]:
+        now = datetime.now(tz=_zoneinfo(location.timezone))
+        if cache is None:
+            return astronomical_variables_from_location(location, now)
+
+        # Events are the same for the whole day at the given place, so re-evaluations reuse the cached ones
+        key = f"astro:{now.date().isoformat()}:{round(location.latitude, 4)}:{round(location.longitude, 4)}"
+        cached = await cache.get("astronomical_variables")
+        if cached is not None and cached[0] == key:
+            logger.info("Astronomical events available from cache", key=key)
+            return cached[1]
+
+        variables = astronomical_variables_from_location(location, now)
+        # Single entry holding only the latest day, so the cache does not grow over time
+        await cache.set("astronomical_variables", (key, variables))
+        return variables
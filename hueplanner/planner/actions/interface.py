@@ -14,6 +14,8 @@ class EvaluatedAction(Protocol):
 
 
 class PlanAction(Protocol):
+    __slots__ = ()
+
     async def define_action(self, *args, **kwargs) -> EvaluatedAction: ...
 
     # def chain(self, other: PlanAction) -> PlanAction:
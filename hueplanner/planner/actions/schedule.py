@@ -21,76 +21,57 @@ class ClosestScheduleRunStrategy(Enum):
     NEXT_PREV = "NEXT_PREV"
 
 
+def get_closest_tasks(
+    tasks: tuple[SchedulerTask, ...], pivot: datetime | None = None
+) -> tuple[SchedulerTask | None, SchedulerTask | None]:
+    # Single pass for both the most recent previous and the soonest next task,
+    # first task wins on equal times
+    prev_task = next_task = None
+    prev_time = next_time = None
+    for task in tasks:
+        task_prev = task.schedule.prev(pivot)
+        if task_prev is not None and (prev_time is None or task_prev > prev_time):
+            prev_task, prev_time = task, task_prev
+        task_next = task.schedule.next(pivot)
+        if task_next is not None and (next_time is None or task_next < next_time):
+            next_task, next_time = task, task_next
+    return prev_task, next_task
+
+
 def get_closest_prev(
     tasks: tuple[SchedulerTask, ...], overlap: bool, pivot: datetime | None = None
 ) -> SchedulerTask | None:
-    # Initially try to find tasks with valid `prev()` values
-    valid_tasks = [task for task in tasks if task.schedule.prev(pivot) is not None]
-    using_prev = True  # Flag to indicate if we're using `prev()`
-
-    if not valid_tasks and overlap:
-        # If no valid previous tasks and overlap is allowed, try using `next()` instead
-        valid_tasks = [task for task in tasks if task.schedule.next(pivot) is not None]
-        using_prev = False  # We are now using `next()` values
-
-    if not valid_tasks:
-        return None
-
-    # Sort depending on whether we are using `prev()` or `next()`
-    if using_prev:
-        valid_tasks.sort(key=lambda t: t.schedule.prev(pivot), reverse=True)  # Sort by `prev()` (most recent first)
-    else:
-        valid_tasks.sort(key=lambda t: t.schedule.next(pivot))  # Sort by `next()` (soonest first)
-
-    return valid_tasks[0] if valid_tasks else None
+    prev_task, next_task = get_closest_tasks(tasks, pivot)
+    # If no previous task and overlap is allowed, use the closest next one instead
+    if prev_task is None and overlap:
+        return next_task
+    return prev_task
 
 
 def get_closest_next(
     tasks: tuple[SchedulerTask, ...], overlap: bool, pivot: datetime | None = None
 ) -> SchedulerTask | None:
-    # Initially try to find tasks with valid `next()` values
-    valid_tasks = [task for task in tasks if task.schedule.next(pivot) is not None]
-    using_next = True  # Flag to indicate if we're using `next()`
-
-    if not valid_tasks and overlap:
-        # If no valid next tasks and overlap is allowed, try using `prev()` instead
-        valid_tasks = [task for task in tasks if task.schedule.prev(pivot) is not None]
-        using_next = False  # We are now using `prev()` values
-
-    if not valid_tasks:
-        return None
-
-    # Sort depending on whether we are using `next()` or `prev()`
-    if using_next:
-        valid_tasks.sort(key=lambda t: t.schedule.next(pivot))  # Sort by `next()` (soonest first)
-    else:
-        valid_tasks.sort(key=lambda t: t.schedule.prev(pivot), reverse=True)  # Sort by `prev()` (most recent first)
-
-    return valid_tasks[0] if valid_tasks else None
+    prev_task, next_task = get_closest_tasks(tasks, pivot)
+    # If no next task and overlap is allowed, use the closest previous one instead
+    if next_task is None and overlap:
+        return prev_task
+    return next_task
 
 
 def get_closest_next_prev(
     tasks: tuple[SchedulerTask, ...], overlap: bool, pivot: datetime | None = None
 ) -> SchedulerTask | None:
-    # Try to find the closest previous task
-    prev_task = get_closest_next(tasks, overlap, pivot)
-    if prev_task is not None:
-        return prev_task
-
-    # If no previous task, fallback to the closest next task
-    return get_closest_prev(tasks, overlap, pivot)
+    # Closest next task, falling back to the closest previous one
+    prev_task, next_task = get_closest_tasks(tasks, pivot)
+    return next_task if next_task is not None else prev_task
 
 
 def get_closest_prev_next(
     tasks: tuple[SchedulerTask, ...], overlap: bool, pivot: datetime | None = None
 ) -> SchedulerTask | None:
-    # Try to find the closest next task
-    next_task = get_closest_prev(tasks, overlap, pivot)
-    if next_task is not None:
-        return next_task
-
-    # If no next task, fallback to the closest previous task
-    return get_closest_next(tasks, overlap, pivot)
+    # Closest previous task, falling back to the closest next one
+    prev_task, next_task = get_closest_tasks(tasks, pivot)
+    return prev_task if prev_task is not None else next_task
 
 
 STRATEGIES = {
@@ -109,22 +90,19 @@ class PlanActionRunClosestSchedule(PlanAction, Serializable):
 
     async def define_action(self) -> EvaluatedAction:
         strategy = STRATEGIES[self.strategy]
+        scheduler_tags = self.scheduler_tags
 
         async def run_closest_schedule(scheduler: Scheduler):
             logger.info("Off-schedule task execution requested", action=repr(self))
 
-            all_tasks = scheduler.get_schedule()
-            tasks = []
-
-            for task in all_tasks:
-                if self.scheduler_tags is None:
-                    tasks.append(task)
-                    continue
+            # Closest tasks are found by a linear scan, so schedule ordering is not required here
+            tasks = scheduler.get_tasks()
+            if scheduler_tags is not None:
                 # Check if the task's tags match
-                if len(task.tags) and task.tags.issubset(self.scheduler_tags):
-                    tasks.append(task)
+                tasks = tuple(task for task in tasks if task.tags and task.tags <= scheduler_tags)
 
-            closest_task = strategy(tuple(tasks), overlap=self.allow_overlap)
+            # Every schedule is evaluated against the same moment
+            closest_task = strategy(tasks, overlap=self.allow_overlap, pivot=datetime.now(scheduler.tz))
             if not closest_task:
                 logger.warning("No closest task found based on strategy", strategy=self.strategy.name)
                 return
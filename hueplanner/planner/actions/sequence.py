@@ -8,25 +8,32 @@ logger = structlog.getLogger(__name__)
 
 
 class PlanActionSequence(PlanAction):
-    def __init__(self, *actions: tuple[PlanAction, ...]) -> None:
+    __slots__ = ("_actions", "_repr")
+
+    def __init__(self, *actions: PlanAction) -> None:
         super().__init__()
-        self._actions: tuple[PlanAction, ...] = tuple(item for a in actions for item in self._unpack_nested_sequence(a))
+        # Nested sequences are flattened on construction, so one level of unpacking is enough.
+        # Exact type check: subclasses may define their actions differently and are kept as a unit.
+        flat: list[PlanAction] = []
+        for action in actions:
+            if type(action) is PlanActionSequence:
+                flat.extend(action._actions)
+            else:
+                flat.append(action)
+        self._actions: tuple[PlanAction, ...] = tuple(flat)
+        self._repr: str | None = None
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}(items=[" + ", ".join(repr(i) for i in self._actions) + "])"
-
-    def _unpack_nested_sequence(self, action: PlanAction) -> tuple[PlanAction, ...]:
-        if isinstance(action, PlanActionSequence):
-            return action._actions
-        return (action,)
+        # Actions are immutable after construction, so the (potentially long) repr is built once
+        if self._repr is None:
+            self._repr = f"{self.__class__.__name__}(items=[" + ", ".join(repr(i) for i in self._actions) + "])"
+        return self._repr
 
     async def define_action(self, ioc: IOC) -> EvaluatedAction:
         logger.info("Preparing sequence actions", actions=self._actions)
 
-        evaluated_actions: list[EvaluatedAction] = []
-        for action in self._actions:
-            evaluated_action = await ioc.make(action.define_action)
-            evaluated_actions.append(evaluated_action)
+        # Defined one by one: actions like PopulateGeoVariables declare values later definitions resolve
+        evaluated_actions = tuple([await ioc.make(action.define_action) for action in self._actions])
 
         async def run_sequence_evaluated_action():
             logger.info("Sequence action requested", action=repr(self))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Protocol
+import asyncio
+from typing import Callable, Protocol
 
 import structlog
 from pydantic.dataclasses import dataclass
@@ -18,7 +19,7 @@ from .interface import EvaluatedAction, PlanAction
 logger = structlog.getLogger(__name__)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True, frozen=True)
 class PlanActionStoreScene(PlanAction, Protocol):
     db_key: str
     db: str = "stored_scenes"
@@ -30,30 +31,31 @@ class PlanActionStoreScene(PlanAction, Protocol):
         hue_v2: HueBridgeV2,
         storage: IKeyValueStorage,
     ) -> EvaluatedAction:
-        scenes_v1 = await storage.create_collection(self.db)
-        scenes_v2 = await storage.create_collection(derive_v2_db_name(self.db))
-
-        required_scene_v1 = None
-        required_scene_v2 = None
+        scenes_v1, scenes_v2, all_scenes_v1, all_scenes_v2 = await asyncio.gather(
+            storage.create_collection(self.db),
+            storage.create_collection(derive_v2_db_name(self.db)),
+            hue_v1.get_scenes(),
+            hue_v2.get_scenes(),
+        )
 
-        for scene in await hue_v1.get_scenes():
-            if self.match_scene(scene):
-                required_scene_v1 = scene.model_copy()  # ensure we don't loose model in closure below
-                break
-        else:
+        required_scene_v1 = next(filter(self._make_matcher(), all_scenes_v1), None)
+        if required_scene_v1 is None:
             raise ValueError("Required scene (v1) not found")
+        required_scene_v1 = required_scene_v1.model_copy()  # ensure we don't loose model in closure below
 
-        for scene in await hue_v2.get_scenes():
-            if await self.match_scene_v2(hue_v2, scene):
-                required_scene_v2 = scene.model_copy()  # ensure we don't loose model in closure below
-                break
-        else:
+        required_scene_v2 = await self.find_scene_v2(hue_v2, all_scenes_v2)
+        if required_scene_v2 is None:
             raise ValueError("Required scene (v2) not found")
+        required_scene_v2 = required_scene_v2.model_copy()  # ensure we don't loose model in closure below
+
+        action_repr = repr(self)
 
         async def set_scene():
-            logger.info("Storing scene requested", action=repr(self))
-            await scenes_v1.set(self.db_key, required_scene_v1)
-            await scenes_v2.set(self.db_key, required_scene_v2)
+            logger.info("Storing scene requested", action=action_repr)
+            await asyncio.gather(
+                scenes_v1.set(self.db_key, required_scene_v1),
+                scenes_v2.set(self.db_key, required_scene_v2),
+            )
 
             log = logger.bind(
                 scene_id=required_scene_v1.id,
@@ -77,48 +79,54 @@ class PlanActionStoreScene(PlanAction, Protocol):
             "Store scene action prepared",
             scene=repr(required_scene_v1.id),
             scene_id_v2=required_scene_v2.id,
-            action=repr(self),
+            action=action_repr,
         )
         return set_scene
 
-    def match_scene(self, scene: SceneV1) -> bool: ...
+    def _make_matcher(self) -> Callable[[SceneV1], bool]: ...
 
-    async def match_scene_v2(self, hue_v2: HueBridgeV2, scene: SceneV2) -> bool: ...
+    async def find_scene_v2(self, hue_v2: HueBridgeV2, scenes: list[SceneV2]) -> SceneV2 | None: ...
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True, frozen=True)
 class PlanActionStoreSceneByName(PlanActionStoreScene, Serializable):
     name: str
     group: int | None = None
 
-    def match_scene(self, scene: SceneV1) -> bool:
-        if scene.name == self.name:
-            if not self.group:
-                return True
-            if scene.group == self.group:
-                return True
-        return False
-
-    async def match_scene_v2(self, hue_v2: HueBridgeV2, scene: SceneV2) -> bool:
-        if scene.metadata.name == self.name:
-            if not self.group:
-                return True
-            group = await hue_v2.get_zone(scene.group.rid)
-            if not group.id_v1:
+    def _make_matcher(self) -> Callable[[SceneV1], bool]:
+        if not self.group:
+            return lambda scene, name=self.name: scene.name == name
+        return lambda scene, name=self.name, group=self.group: scene.name == name and scene.group == group
+
+    async def find_scene_v2(self, hue_v2: HueBridgeV2, scenes: list[SceneV2]) -> SceneV2 | None:
+        if not self.group:
+            return next(filter(lambda scene, name=self.name: scene.metadata.name == name, scenes), None)
+        candidates = [scene for scene in scenes if scene.metadata.name == self.name]
+
+        # Fetch zones of name-matched scenes concurrently, each zone only once
+        zone_ids = list({scene.group.rid for scene in candidates})
+        zones = dict(zip(zone_ids, await asyncio.gather(*(hue_v2.get_zone(rid) for rid in zone_ids))))
+        group = self.group
+
+        def in_group(scene: SceneV2) -> bool:
+            zone_id_v1 = zones[scene.group.rid].id_v1
+            if not zone_id_v1:
                 return False
-            if str(group.id_v1.split("/groups/")[-1]).lower() == str(self.group).lower():
-                return True
-        return False
+            try:
+                return int(zone_id_v1.rsplit("/groups/", 1)[-1]) == group
+            except ValueError:
+                return False
+
+        return next(filter(in_group, candidates), None)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True, frozen=True)
 class PlanActionStoreSceneById(PlanActionStoreScene, Serializable):
     id: str
 
-    def match_scene(self, scene: SceneV1) -> bool:
-        return scene.id == self.id
+    def _make_matcher(self) -> Callable[[SceneV1], bool]:
+        return lambda scene, id=self.id: scene.id == id
 
-    async def match_scene_v2(self, hue_v2: HueBridgeV2, scene: SceneV2) -> bool:
-        if not scene.id_v1:
-            return False
-        return scene.id_v1.split("/scenes/")[-1] == self.id
+    async def find_scene_v2(self, hue_v2: HueBridgeV2, scenes: list[SceneV2]) -> SceneV2 | None:
+        suffix = f"/scenes/{self.id}"
+        return next(filter(lambda scene: scene.id_v1 is not None and scene.id_v1.endswith(suffix), scenes), None)
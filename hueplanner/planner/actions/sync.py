@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+from functools import partial
+from typing import Any, Callable
+
 import structlog
 from pydantic.dataclasses import dataclass
 
@@ -13,99 +17,140 @@ from .interface import EvaluatedAction, PlanAction
 
 logger = structlog.getLogger(__name__)
 
+# Upper bound of in-flight light requests to the bridge during a single sync
+MAX_CONCURRENT_LIGHT_REQUESTS = 8
 
-@dataclass(kw_only=True)
-class PlanActionSyncScene(PlanAction, Serializable):
-    db_key: str
-    db: str = "stored_scenes"
+BRIGHTNESS_TOLERANCE = 0.5
+COLOR_TOLERANCE = 0.0001
 
-    @staticmethod
-    def scene_action_differs(logger, light: Light, action_data: SceneActionData) -> bool:
-        BRIGHTNESS_TOLERANCE = 0.5
-        COLOR_TOLERANCE = 0.0001
-
-        # Compare on/off
-        if action_data.on is not None:
-            light_is_on = light.dimming is not None and light.dimming.brightness > 0
-            required_on = action_data.on.on
-            if required_on and not light_is_on:
-                logger.debug(
-                    "Light differs: on state",
-                    required=required_on,
-                    current=light_is_on,
-                    reason="Light should be on but is off",
-                )
-                return True
-            if not required_on and light_is_on:
-                logger.debug(
-                    "Light differs: on state",
-                    required=required_on,
-                    current=light_is_on,
-                    reason="Light should be off but is on",
-                )
-                return True
 
-        # Compare dimming (with tolerance)
-        if action_data.dimming is not None:
-            required_brightness = action_data.dimming.brightness
-            current_brightness = light.dimming.brightness  # type: ignore
-            if abs(required_brightness - current_brightness) > BRIGHTNESS_TOLERANCE:
-                logger.debug(
-                    "Light differs: brightness",
-                    required=required_brightness,
-                    current=current_brightness,
-                    tolerance=BRIGHTNESS_TOLERANCE,
-                )
-                return True
+LightDiffer = Callable[[Any, Light], bool]
 
-        # Compare color temperature (ignore mirek_valid, mirek_schema)
-        if action_data.color_temperature is not None:
-            required_mirek = action_data.color_temperature.mirek
-            current_mirek = light.color_temperature.mirek
-            if required_mirek != current_mirek:
-                logger.debug("Light differs: mirek", required=required_mirek, current=current_mirek)
-                return True
 
-        # Compare color (xy)
-        if action_data.color is not None and action_data.color.xy is not None:
-            required_x = action_data.color.xy.x
-            required_y = action_data.color.xy.y
-            current_x = light.color.xy.x  # type: ignore
-            current_y = light.color.xy.y  # type: ignore
-            if abs(required_x - current_x) > COLOR_TOLERANCE or abs(required_y - current_y) > COLOR_TOLERANCE:
-                logger.debug(
-                    "Light differs: color xy",
-                    required_x=required_x,
-                    required_y=required_y,
-                    current_x=current_x,
-                    current_y=current_y,
-                    tolerance=COLOR_TOLERANCE,
-                )
-                return True
+def make_scene_action_differ(action_data: SceneActionData) -> LightDiffer:
+    """Build a light comparator containing only the checks relevant for the given scene action."""
+    checks: list[LightDiffer] = []
 
-        # Compare gradient
-        if action_data.gradient is not None:
-            logger.debug("Light differs: gradient set but not in light", required=str(action_data.gradient))
+    # Compare on/off
+    if action_data.on is not None:
+        required_on = action_data.on.on
+
+        def on_differs(logger, light: Light) -> bool:
+            light_dimming = light.dimming
+            light_is_on = light_dimming is not None and light_dimming.brightness > 0
+            if required_on == light_is_on:
+                return False
+            logger.debug(
+                "Light differs: on state",
+                required=required_on,
+                current=light_is_on,
+                reason="Light should be on but is off" if required_on else "Light should be off but is on",
+            )
             return True
 
-        # Compare effects
-        if action_data.effects is not None:
-            logger.debug("Light differs: effects set but not in light", required=str(action_data.effects))
+        checks.append(on_differs)
+
+    # Compare dimming (with tolerance)
+    if action_data.dimming is not None:
+        required_brightness = action_data.dimming.brightness
+
+        def brightness_differs(logger, light: Light) -> bool:
+            current_brightness = light.dimming.brightness  # type: ignore
+            if abs(required_brightness - current_brightness) <= BRIGHTNESS_TOLERANCE:
+                return False
+            logger.debug(
+                "Light differs: brightness",
+                required=required_brightness,
+                current=current_brightness,
+                tolerance=BRIGHTNESS_TOLERANCE,
+            )
+            return True
+
+        checks.append(brightness_differs)
+
+    # Compare color temperature (ignore mirek_valid, mirek_schema)
+    if action_data.color_temperature is not None:
+        required_mirek = action_data.color_temperature.mirek
+
+        def mirek_differs(logger, light: Light) -> bool:
+            current_mirek = light.color_temperature.mirek
+            if required_mirek == current_mirek:
+                return False
+            logger.debug("Light differs: mirek", required=required_mirek, current=current_mirek)
             return True
 
-        # Compare dynamics
-        if action_data.dynamics is not None:
-            logger.debug("Light differs: dynamics set but not in light", required=str(action_data.dynamics))
+        checks.append(mirek_differs)
+
+    # Compare color (xy)
+    if action_data.color is not None and action_data.color.xy is not None:
+        required_x = action_data.color.xy.x
+        required_y = action_data.color.xy.y
+
+        def color_differs(logger, light: Light) -> bool:
+            current_xy = light.color.xy  # type: ignore
+            current_x = current_xy.x
+            current_y = current_xy.y
+            if abs(required_x - current_x) <= COLOR_TOLERANCE and abs(required_y - current_y) <= COLOR_TOLERANCE:
+                return False
+            logger.debug(
+                "Light differs: color xy",
+                required_x=required_x,
+                required_y=required_y,
+                current_x=current_x,
+                current_y=current_y,
+                tolerance=COLOR_TOLERANCE,
+            )
             return True
 
-        # If we reach here, no differences found
+        checks.append(color_differs)
+
+    # Gradient, effects and dynamics are not reported by the light, so they always differ
+    for field in ("gradient", "effects", "dynamics"):
+        required = getattr(action_data, field)
+        if required is not None:
+            checks.append(partial(_always_differs, field, required))
+            break
+
+    if not checks:
+        return _never_differs
+    if len(checks) == 1:
+        return checks[0]
+
+    def differs(logger, light: Light) -> bool:
+        for check in checks:
+            if check(logger, light):
+                return True
         return False
 
+    return differs
+
+
+def _always_differs(field: str, required: Any, logger, light: Light) -> bool:
+    logger.debug("Light differs: field set but not in light", field=field, required=required)
+    return True
+
+
+def _never_differs(logger, light: Light) -> bool:
+    return False
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class PlanActionSyncScene(PlanAction, Serializable):
+    db_key: str
+    db: str = "stored_scenes"
+
     async def define_action(self, storage: IKeyValueStorage, hue_v2: HueBridgeV2) -> EvaluatedAction:
+        scenes_v2 = await storage.create_collection(derive_v2_db_name(self.db))
+        action_repr = repr(self)
+
+        # Light comparators specialized for the stored scene, rebuilt only when the stored scene changes
+        differs_scene: Scene | None = None
+        differs: tuple[LightDiffer, ...] = ()
+
         async def toggle_current_scene():
-            logger.info("Scene sync requested", action=repr(self))
+            logger.info("Scene sync requested", action=action_repr)
 
-            scenes_v2 = await storage.create_collection(derive_v2_db_name(self.db))
+            nonlocal differs_scene, differs
             scene_v2: Scene | None = await scenes_v2.get(self.db_key)
 
             if not scene_v2:
@@ -113,19 +158,38 @@ class PlanActionSyncScene(PlanAction, Serializable):
                 return
             logger.debug("Context current scene obtained", stored_scene_id=self.db_key, scene_v2=scene_v2)
 
-            for targeted_action in scene_v2.actions:
-                light = await hue_v2.get_light(targeted_action.target.rid)
+            if differs_scene is None or differs_scene != scene_v2:
+                differs = tuple(
+                    make_scene_action_differ(targeted_action.action) for targeted_action in scene_v2.actions
+                )
+                differs_scene = scene_v2
+
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_LIGHT_REQUESTS)
+
+            async def bounded(coro):
+                async with semaphore:
+                    return await coro
+
+            lights = await asyncio.gather(
+                *(bounded(hue_v2.get_light(targeted_action.target.rid)) for targeted_action in scene_v2.actions)
+            )
+
+            updates = []
+            for targeted_action, light, light_differs in zip(scene_v2.actions, lights, differs):
                 log = logger.bind(id_v1=light.id_v1, id_v2=light.id, name=light.metadata.name)
 
                 log.debug("Testing light")
-                if self.scene_action_differs(log, light, targeted_action.action):
+                if light_differs(log, light):
                     update = targeted_action.action.as_light_update_request()
                     log.info("Light differs from required, performing update", update=update)
-                    res = await hue_v2.update_light(targeted_action.target.rid, update)
-                    log.info("Light updated", res=res)
+                    updates.append((targeted_action.target.rid, update, log))
                 else:
                     log.debug("No update required for light")
 
-            logger.info("Scene sync performed", action=repr(self))
+            results = await asyncio.gather(*(bounded(hue_v2.update_light(rid, update)) for rid, update, _ in updates))
+            for (_, _, log), res in zip(updates, results):
+                log.info("Light updated", res=res)
+
+            logger.info("Scene sync performed", action=action_repr)
 
         return toggle_current_scene
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Any
+
 import structlog
 from pydantic.dataclasses import dataclass
 
@@ -11,8 +14,11 @@ from .interface import EvaluatedAction, PlanAction
 
 logger = structlog.getLogger(__name__)
 
+# Shared between calls and never mutated; kept a plain dict since the client JSON-encodes it as is
+_OFF_ACTION: dict[str, Any] = {"on": False}
+
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True, frozen=True)
 class PlanActionToggleStoredScene(PlanAction, Serializable):
     db_key: str
     db: str = "stored_scenes"
@@ -22,21 +28,39 @@ class PlanActionToggleStoredScene(PlanAction, Serializable):
         storage: IKeyValueStorage,
         hue_v1: HueBridgeV1,
     ) -> EvaluatedAction:
+        scenes = await storage.create_collection(self.db)
+        action_repr = repr(self)
+
+        # Group of the previously toggled scene. The stored scene rarely changes between toggles,
+        # so its group state is requested speculatively alongside the storage lookup.
+        last_group: int | None = None
+
         async def toggle_current_scene():
-            logger.info("Scene toggling requested", action=repr(self))
-
-            scenes = await storage.create_collection(self.db)
-            scene = await scenes.get(self.db_key)
-            if not scene:
-                logger.warning("Can't toggle scene, because it was not set yet")
-                return
-            logger.debug("Context current scene obtained", stored_scene_id=self.db_key, scene=scene)
-            group = await hue_v1.get_group(scene.group)
+            nonlocal last_group
+            logger.info("Scene toggling requested", action=action_repr)
+
+            group_task = asyncio.create_task(hue_v1.get_group(last_group)) if last_group is not None else None
+            try:
+                scene = await scenes.get(self.db_key)
+                if not scene:
+                    logger.warning("Can't toggle scene, because it was not set yet")
+                    return
+                logger.debug("Context current scene obtained", stored_scene_id=self.db_key, scene=scene)
+                if scene.group == last_group and group_task is not None:
+                    group = await group_task
+                else:
+                    group = await hue_v1.get_group(scene.group)
+                last_group = scene.group
+            finally:
+                # The speculative request is never left behind, whether it was unused, failed or interrupted
+                if group_task is not None:
+                    group_task.cancel()
+                    await asyncio.gather(group_task, return_exceptions=True)
             logger.debug("Current group state", group_id=group.id, group_state=group.state)
 
             # TODO: Better typing - use models, not dict
             if group.state.all_on:
-                action = {"on": False}
+                action = _OFF_ACTION
                 logger.info("Turning light off", group=scene.group)
             else:
                 logger.info(
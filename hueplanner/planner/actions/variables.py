@@ -11,15 +11,18 @@ from .interface import EvaluatedAction, PlanAction
 logger = structlog.getLogger(__name__)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True, frozen=True)
 class PlanActionFlushDb(PlanAction, Serializable):
     db: str
 
     async def define_action(self, storage: IKeyValueStorage) -> EvaluatedAction:
+        db = await storage.create_collection(self.db)
+        action_repr = repr(self)
+        db_name = self.db
+
         async def action():
-            logger.info("Flushing database requested", action=repr(self))
-            db = await storage.create_collection(self.db)
+            logger.info("Flushing database requested", action=action_repr)
             await db.delete_all()
-            logger.info("Database data removed", name=self.db)
+            logger.info("Database data removed", name=db_name)
 
         return action
@@ -10,18 +10,18 @@ logger = structlog.getLogger(__name__)
 class PlanConditionContainer(PlanCondition):
     def __init__(self, *conditions: tuple[PlanCondition, ...]) -> None:
         super().__init__()
-        self._conditions: tuple[PlanCondition, ...] = tuple(
-            item for a in conditions for item in self._unpack_nested_sequence(a)
-        )
+        # Only containers of the same kind can be merged, AND inside OR (and vice versa) keeps its grouping
+        flat: list[PlanCondition] = []
+        for condition in conditions:
+            if type(condition) is type(self):
+                flat.extend(condition._conditions)  # type: ignore[attr-defined]
+            else:
+                flat.append(condition)  # type: ignore[arg-type]
+        self._conditions: tuple[PlanCondition, ...] = tuple(flat)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(items=[" + ", ".join(repr(i) for i in self._conditions) + "])"
 
-    def _unpack_nested_sequence(self, action: PlanCondition) -> tuple[PlanCondition, ...]:
-        if isinstance(action, PlanConditionContainer):
-            return action._conditions
-        return (action,)
-
     async def define_condition(self, ioc: IOC) -> EvaluatedCondition:
         logger.info("Preparing sequence condition", actions=self._conditions)
 
@@ -33,14 +33,17 @@ class PlanConditionContainer(PlanCondition):
         logger.info("Sequence condition prepared", evaluated_conditions=evaluated_conditions)
         return self._make_condition(evaluated_conditions)
 
-    def _make_condition(self, evaluated_condition: list[EvaluatedCondition]) -> EvaluatedCondition: ...
+    def _make_condition(self, evaluated_conditions: list[EvaluatedCondition]) -> EvaluatedCondition: ...
 
 
 class PlanConditionOr(PlanConditionContainer):
     def _make_condition(self, evaluated_conditions: list[EvaluatedCondition]) -> EvaluatedCondition:
+        condition_repr = repr(self)
+        conditions = tuple(evaluated_conditions)
+
         async def run_sequence_evaluated_condition() -> bool:
-            logger.info("OR condition requested", action=repr(self))
-            for evaluated_cond in evaluated_conditions:
+            logger.info("OR condition requested", action=condition_repr)
+            for evaluated_cond in conditions:
                 res = await evaluated_cond()
                 if res:
                     return res
@@ -51,9 +54,12 @@ class PlanConditionOr(PlanConditionContainer):
 
 class PlanConditionAnd(PlanConditionContainer):
     def _make_condition(self, evaluated_conditions: list[EvaluatedCondition]) -> EvaluatedCondition:
+        condition_repr = repr(self)
+        conditions = tuple(evaluated_conditions)
+
         async def run_sequence_evaluated_condition() -> bool:
-            logger.info("OR condition requested", action=repr(self))
-            for evaluated_cond in evaluated_conditions:
+            logger.info("AND condition requested", action=condition_repr)
+            for evaluated_cond in conditions:
                 res = await evaluated_cond()
                 if not res:
                     return False
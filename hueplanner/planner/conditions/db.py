@@ -10,14 +10,16 @@ from .interface import EvaluatedCondition, PlanCondition
 logger = structlog.getLogger(__name__)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True, frozen=True)
 class PlanConditionDBKeyNotSet(PlanCondition, Serializable):
     db: str = "stored_scenes"
     db_key: str
 
     async def define_condition(self, storage: IKeyValueStorage) -> EvaluatedCondition:
+        db = await storage.create_collection(self.db)
+        db_key = self.db_key
+
         async def check():
-            db = await storage.create_collection(self.db)
-            return not (await db.contains(self.db_key))
+            return not (await db.contains(db_key))
 
         return check
@@ -9,4 +9,6 @@ class EvaluatedCondition(Protocol):
 
 
 class PlanCondition(Protocol):
+    __slots__ = ()
+
     async def define_condition(self, *args, **kwargs) -> EvaluatedCondition: ...
@@ -6,7 +6,7 @@ from .actions import PlanAction
 from .triggers import PlanTrigger
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PlanEntry:
     trigger: PlanTrigger
     action: PlanAction
@@ -1,12 +1,21 @@
+from functools import lru_cache
 from typing import Any, Protocol
 
 from pydantic import TypeAdapter
 
 
+@lru_cache(maxsize=None)
+def _type_adapter(cls: type) -> TypeAdapter:
+    # Building the core schema dominates TypeAdapter cost, so keep one adapter per class
+    return TypeAdapter(cls)
+
+
 class Serializable(Protocol):
+    __slots__ = ()
+
     @classmethod
     def loads(cls, data: dict[str, Any]):
-        return TypeAdapter(cls).validate_python(data)
+        return _type_adapter(cls).validate_python(data)
 
     def dumps(self) -> dict[str, Any]:
-        return TypeAdapter(self.__class__).dump_python(self)
+        return _type_adapter(self.__class__).dump_python(self)
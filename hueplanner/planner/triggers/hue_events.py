@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Protocol
+from typing import Awaitable, Callable, Protocol
 
 import structlog
 from pydantic.dataclasses import dataclass
@@ -16,18 +16,24 @@ logger = structlog.getLogger(__name__)
 
 
 class PlanTriggerOnHueEvent(PlanTrigger, Protocol):
+    __slots__ = ()
+
     async def apply_trigger(self, action: EvaluatedAction, stream_listener: HueEventStreamListener):
+        trigger_repr = repr(self)
+
         async def cb_action(_: HueEvent) -> None:
-            logger.info("Hue event matched requirements, executing action", trigger=repr(self))
+            logger.info("Hue event matched requirements, executing action", trigger=trigger_repr)
             return await action()
 
-        stream_listener.register_callback(self._check, cb_action)
-        logger.info("Registered HueEventStream event listener", trigger=repr(self))
+        stream_listener.register_callback(self._make_check(), cb_action)
+        logger.info("Registered HueEventStream event listener", trigger=trigger_repr)
 
-    async def _check(self, hevent: HueEvent) -> bool: ...
+    def _make_check(self) -> Callable[[HueEvent], Awaitable[bool]]:
+        """Build the event predicate once, with trigger parameters bound as locals."""
+        ...
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PlanTriggerOnHueButtonEvent(PlanTriggerOnHueEvent, Serializable):
     resource_id: str
     action: str
@@ -36,29 +42,37 @@ class PlanTriggerOnHueButtonEvent(PlanTriggerOnHueEvent, Serializable):
         if self.resource_id == "" or self.action == "":
             raise ValueError("Fields 'resource_id' and 'action' cannot be empty")
 
-    async def _check(self, hevent: HueEvent) -> bool:
-        for event in hevent.data:
-            for data in event["data"]:
-                if data["id"] == self.resource_id and data["type"] == "button":
-                    report = data[data["type"]]["button_report"]
-                    if report["event"] == self.action:
-                        return True
-        return False
+    def _make_check(self) -> Callable[[HueEvent], Awaitable[bool]]:
+        key = ("button", self.resource_id)
+        required_event = self.action
+
+        async def check(hevent: HueEvent) -> bool:
+            for data in hevent.indexed.get(key, ()):
+                if data["button"]["button_report"]["event"] == required_event:
+                    return True
+            return False
 
+        return check
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class PlanTriggerConnectivity(PlanTriggerOnHueEvent, Serializable):
     status: str
     id: str | None = None
 
-    async def _check(self, hevent: HueEvent) -> bool:
-        for event in hevent.data:
-            for data in event["data"]:
-                if data["type"] == "zigbee_connectivity":
-                    if data["status"] != self.status:
-                        return False
-                    if not self.id:
-                        return True
-                    return self.id == data["id"]
-
-        return False
+    def _make_check(self) -> Callable[[HueEvent], Awaitable[bool]]:
+        key = ("zigbee_connectivity", self.id or None)
+        required_status = self.status
+
+        if key[1] is None:
+
+            async def check(hevent: HueEvent) -> bool:
+                items = hevent.indexed.get(key)
+                return bool(items) and items[0]["status"] == required_status
+
+        else:
+
+            async def check(hevent: HueEvent) -> bool:
+                return any(data["status"] == required_status for data in hevent.indexed.get(key, ()))
+
+        return check
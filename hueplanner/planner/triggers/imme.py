@@ -11,7 +11,7 @@ from .interface import PlanTrigger
 logger = structlog.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PlanTriggerImmediately(PlanTrigger, Serializable):
     async def apply_trigger(self, action: EvaluatedAction):
         logger.info("Executing action immediately", action=action, trigger=repr(self))
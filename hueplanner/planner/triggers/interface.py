@@ -8,5 +8,6 @@ from hueplanner.planner.actions import EvaluatedAction
 
 
 class PlanTrigger(Protocol):
+    __slots__ = ()
 
     async def apply_trigger(self, action: EvaluatedAction, *args, **kwargs): ...
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import field
 from datetime import datetime, time, timedelta, tzinfo
-from typing import Annotated, Protocol
+from functools import lru_cache
+from typing import Annotated
 
-import pytimeparse2 as pytimeparse
 import structlog
 from pydantic import BeforeValidator
 from pydantic.dataclasses import dataclass
@@ -13,7 +14,7 @@ from hueplanner.planner.actions import EvaluatedAction
 from hueplanner.planner.serializable import Serializable
 from hueplanner.scheduler import Scheduler
 from hueplanner.storage.interface import IKeyValueStorage
-from hueplanner.time_parser import TimeParser
+from hueplanner.time_parser import TimeParser, parse_duration, parse_static_time, parse_time_expression
 
 from .interface import PlanTrigger
 
@@ -21,10 +22,29 @@ logger = structlog.getLogger(__name__)
 
 
 def parse_timedelta(value: str) -> timedelta:
-    return timedelta(seconds=pytimeparse.parse(value))  # type: ignore
+    return timedelta(seconds=parse_duration(value))  # type: ignore
 
 
-@dataclass(kw_only=True)
+@lru_cache(maxsize=256)
+def _wall_time(time_str: str, tz: tzinfo) -> time:
+    # Expressions without variables resolve to the same wall-clock time for a given timezone
+    return parse_static_time(time_str, tz).timetz()
+
+
+async def _resolve_time(time_str: str, tz: tzinfo, variables_db: list[str], storage: IKeyValueStorage) -> time:
+    expression = parse_time_expression(time_str)
+    if expression.variable is None:
+        # No collections or parser are needed, and the result is shared between triggers
+        return _wall_time(time_str, tz)
+
+    # Variables may be updated between plan applications, so they are always looked up. Collections too:
+    # storages memoize them and forget deleted ones, so a replaced collection is never read
+    variables_collections = list(await asyncio.gather(*(storage.create_collection(db) for db in variables_db)))
+    parser = TimeParser(tz, variables_collections)
+    return (await parser.parse(time_str)).timetz()
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
 class PlanTriggerOnce(PlanTrigger, Serializable):
     time: str
     alias: str | None = None
@@ -33,24 +53,20 @@ class PlanTriggerOnce(PlanTrigger, Serializable):
     shift_if_late: bool = False
 
     async def apply_trigger(self, action: EvaluatedAction, scheduler: Scheduler, storage: IKeyValueStorage, tz: tzinfo):
-        variables_collections = []
-        for variables_db in self.variables_db:
-            variables_collections.append(await storage.create_collection(variables_db))
-
-        alias = self.alias if self.alias is not None else f"{self.time}"
-        act_on_time = (await TimeParser(tz, variables_collections).parse(self.time)).timetz()
+        alias = self.alias if self.alias is not None else self.time
+        act_on_time = await _resolve_time(self.time, tz, self.variables_db, storage)
 
         task = scheduler.once(
             coro=action,
             run_at=act_on_time,
             alias=alias,
-            tags={self.scheduler_tag} if self.scheduler_tag is not None else None,
+            tags=frozenset((self.scheduler_tag,)) if self.scheduler_tag is not None else None,
             shift_if_late=self.shift_if_late,
         )
         logger.info("Once trigger added to schedule", schedule=task.schedule)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PlanTriggerPeriodic(PlanTrigger, Serializable):
     interval: Annotated[timedelta, BeforeValidator(parse_timedelta)]
     start_at: str | None = None
@@ -58,69 +74,62 @@ class PlanTriggerPeriodic(PlanTrigger, Serializable):
     variables_db: list[str] = field(default_factory=list)
 
     async def apply_trigger(self, action: EvaluatedAction, scheduler: Scheduler, storage: IKeyValueStorage, tz: tzinfo):
-        variables_collections = []
-        for variables_db in self.variables_db:
-            variables_collections.append(await storage.create_collection(variables_db))
-
         start_at = None
         if self.start_at:
-            start_at = (await TimeParser(tz, variables_collections).parse(self.start_at)).timetz()
-
-        alias = (
-            self.alias
-            if self.alias is not None
-            else (
-                f"each {self.interval} since "
-                f"{self.start_at if self.start_at else start_at.isoformat(timespec='seconds')}"
-            )
-        )
+            start_at = await _resolve_time(self.start_at, tz, self.variables_db, storage)
+
+        alias = self.alias
+        if alias is None:
+            # The configured expression reads better than its resolved time and needs no formatting
+            alias = f"each {self.interval} since {self.start_at}" if self.start_at else f"each {self.interval}"
         task = scheduler.periodic(action, interval=self.interval, start_at=start_at, alias=alias)
         logger.info("Periodic trigger added to schedule", schedule=task.schedule, action=action)
 
 
-@dataclass(kw_only=True)
-class _PlanTriggerConvenientPeriodic(PlanTrigger, Serializable, Protocol):
-    alias: str | None = None
-    scheduler_tag: str | None = None
-
-    async def _calculate_params(self, storage: IKeyValueStorage, tz: tzinfo) -> tuple[time, timedelta]: ...
-
-    async def apply_trigger(self, action: EvaluatedAction, scheduler: Scheduler, storage: IKeyValueStorage, tz: tzinfo):
+_ONE_MINUTE = timedelta(minutes=1)
+_ONE_HOUR = timedelta(hours=1)
+_ONE_DAY = timedelta(days=1)
+# Convenience triggers only use these intervals, so their alias text is formatted once
+_INTERVAL_NAMES = {interval: str(interval) for interval in (_ONE_MINUTE, _ONE_HOUR, _ONE_DAY)}
 
-        start_at, interval = await self._calculate_params(storage, tz)
-        alias = (
-            self.alias if self.alias is not None else f"each {interval} since {start_at.isoformat(timespec='seconds')}"
-        )
 
-        task = scheduler.periodic(action, interval=interval, start_at=start_at, alias=alias)
-        logger.info("Periodic trigger added to schedule", schedule=task.schedule, action=action)
+def _add_periodic(
+    scheduler: Scheduler, action: EvaluatedAction, start_at: time, interval: timedelta, alias: str | None
+) -> None:
+    if alias is None:
+        alias = f"each {_INTERVAL_NAMES[interval]} since {start_at.isoformat(timespec='seconds')}"
+    task = scheduler.periodic(action, interval=interval, start_at=start_at, alias=alias)
+    logger.info("Periodic trigger added to schedule", schedule=task.schedule, action=action)
 
 
-@dataclass(kw_only=True)
-class PlanTriggerDaily(_PlanTriggerConvenientPeriodic):
+@dataclass(kw_only=True, slots=True, frozen=True)
+class PlanTriggerDaily(PlanTrigger, Serializable):
+    alias: str | None = None
+    scheduler_tag: str | None = None
     time: str | None = None
     variables_db: list[str] = field(default_factory=list)
 
-    async def _calculate_params(self, storage: IKeyValueStorage, tz: tzinfo) -> tuple[time, timedelta]:
+    async def apply_trigger(self, action: EvaluatedAction, scheduler: Scheduler, storage: IKeyValueStorage, tz: tzinfo):
         if self.time is None:
-            return (datetime.now(tz) + timedelta(days=1)).time(), timedelta(days=1)
-
-        variables_collections = []
-        for variables_db in self.variables_db:
-            variables_collections.append(await storage.create_collection(variables_db))
+            start_at = (datetime.now(tz) + _ONE_DAY).time()
+        else:
+            start_at = await _resolve_time(self.time, tz, self.variables_db, storage)
+        _add_periodic(scheduler, action, start_at, _ONE_DAY, self.alias)
 
-        start_at = (await TimeParser(tz, variables_collections).parse(self.time)).timetz()
 
-        return start_at, timedelta(days=1)
+@dataclass(kw_only=True, slots=True, frozen=True)
+class PlanTriggerMinutely(PlanTrigger, Serializable):
+    alias: str | None = None
+    scheduler_tag: str | None = None
 
+    async def apply_trigger(self, action: EvaluatedAction, scheduler: Scheduler, storage: IKeyValueStorage, tz: tzinfo):
+        _add_periodic(scheduler, action, (datetime.now(tz) + _ONE_MINUTE).time(), _ONE_MINUTE, self.alias)
 
-@dataclass(kw_only=True)
-class PlanTriggerMinutely(_PlanTriggerConvenientPeriodic):
-    async def _calculate_params(self, storage: IKeyValueStorage, tz: tzinfo) -> tuple[time, timedelta]:
-        return (datetime.now(tz) + timedelta(minutes=1)).time(), timedelta(minutes=1)
 
+@dataclass(kw_only=True, slots=True, frozen=True)
+class PlanTriggerHourly(PlanTrigger, Serializable):
+    alias: str | None = None
+    scheduler_tag: str | None = None
 
-@dataclass(kw_only=True)
-class PlanTriggerHourly(_PlanTriggerConvenientPeriodic):
-    async def _calculate_params(self, storage: IKeyValueStorage, tz: tzinfo) -> tuple[time, timedelta]:
-        return (datetime.now(tz) + timedelta(hours=1)).time(), timedelta(hours=1)
+    async def apply_trigger(self, action: EvaluatedAction, scheduler: Scheduler, storage: IKeyValueStorage, tz: tzinfo):
+        _add_periodic(scheduler, action, (datetime.now(tz) + _ONE_HOUR).time(), _ONE_HOUR, self.alias)
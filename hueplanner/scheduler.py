@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-from contextlib import suppress
+import heapq
+from collections import defaultdict
 from datetime import datetime, time, timedelta, tzinfo
 from functools import total_ordering
-from typing import Awaitable, Callable, Protocol
+from itertools import count
+from typing import AbstractSet, Awaitable, Callable, Protocol
 
 import structlog
 
-from hueplanner.wrappers import ReliableWrapper, TimeoutWrapper
+from hueplanner.wrappers import ReliableWrapper, TimeoutWrapper, Wrapper
 
 # Setup structlog for structured logging
 logger = structlog.getLogger(__name__)
@@ -16,6 +18,24 @@ logger = structlog.getLogger(__name__)
 
 Task = Callable[[], Awaitable[None]]
 
+# Shared by every untagged task, tags are never modified after scheduling
+_NO_TAGS: frozenset[str] = frozenset()
+
+
+def _next_run_key(item: tuple[datetime | None, SchedulerTask]) -> tuple[bool, datetime | None]:
+    next_run = item[0]
+    return next_run is not None, next_run
+
+
+def _make_padder(align: str, width: int) -> Callable[[str], str]:
+    """Pad text to the width like str.format with the given alignment, without parsing a format spec."""
+    if align == "<":
+        return lambda text: text.ljust(width)
+    if align == ">":
+        return lambda text: text.rjust(width)
+    # Centered like "^", which puts the odd space on the right, unlike str.center
+    return lambda text: (" " * ((width - len(text)) // 2) + text).ljust(width)
+
 
 def str_cutoff(text: str, max_width: int | None = None) -> str:
     """Cuts off the string to fit the max_width with '...' appended if truncated."""
@@ -69,6 +89,8 @@ class ScheduleOnce(ScheduleEntry):
     ) -> None:
         self.tz = tz
         self.run_at = run_at
+        # Schedules are not modified after creation, and equality compares hashes
+        self._hash = hash(("once", run_at, tz))
 
     def __repr__(self) -> str:
         s = f"{self.__class__.__name__}(run_at={self.run_at}"
@@ -78,31 +100,21 @@ class ScheduleOnce(ScheduleEntry):
         return s
 
     def __hash__(self) -> int:
-        return hash(("once", self.run_at, self.tz))
+        return self._hash
 
     def next_many(self, n: int = 1, pivot: datetime | None = None) -> tuple[datetime, ...]:
         """Return the next execution time if it's in the future, otherwise return an empty tuple."""
         if pivot is None:
             pivot = datetime.now(tz=self.tz)
 
-        # If the run_at is still in the future, return it as a tuple
-        if self.run_at > pivot:
-            return (self.run_at,)
-
-        # If the execution time has passed, return an empty tuple
-        return ()
+        return (self.run_at,) if self.run_at > pivot else ()
 
     def prev_many(self, n: int = 1, pivot: datetime | None = None) -> tuple[datetime, ...]:
         """Return the previous execution time if it has already occurred, otherwise return an empty tuple."""
         if pivot is None:
             pivot = datetime.now(tz=self.tz)
 
-        # If the run_at is in the past, return it as a tuple
-        if self.run_at <= pivot:
-            return (self.run_at,)
-
-        # If the execution time hasn't happened yet, return an empty tuple
-        return ()
+        return (self.run_at,) if self.run_at <= pivot else ()
 
 
 class SchedulePeriodic(ScheduleEntry):
@@ -115,6 +127,8 @@ class SchedulePeriodic(ScheduleEntry):
         self.interval = interval
         self.tz = tz
         self.start_at = start_at if start_at else datetime.now(tz=self.tz).time()
+        # Schedules are not modified after creation, and equality compares hashes
+        self._hash = hash(("periodic", self.start_at, interval, tz))
 
     def __repr__(self) -> str:
         s = f"{self.__class__.__name__}(start_at={self.start_at}, interval={self.interval}"
@@ -124,7 +138,7 @@ class SchedulePeriodic(ScheduleEntry):
         return s
 
     def __hash__(self) -> int:
-        return hash(("periodic", self.start_at, self.interval, self.tz))
+        return self._hash
 
     def next_many(self, n: int = 1, pivot: datetime | None = None) -> tuple[datetime, ...]:
         """Return the next `n` execution times after the `pivot` time."""
@@ -135,17 +149,13 @@ class SchedulePeriodic(ScheduleEntry):
         first_execution = datetime.combine(pivot.date(), self.start_at, tzinfo=self.tz)
         if first_execution < pivot:
             # Move the first execution time forward by intervals until it's after the pivot
-            delta_since_start = (pivot - first_execution).total_seconds()
-            intervals_since_start = (delta_since_start // self.interval.total_seconds()) + 1
-            first_execution += timedelta(seconds=intervals_since_start * self.interval.total_seconds())
+            # timedelta floor division is exact integer arithmetic on microseconds
+            first_execution += self.interval * ((pivot - first_execution) // self.interval + 1)
 
-        result = []
-        current_time = first_execution
-        for _ in range(n):
-            result.append(current_time)
-            current_time += self.interval  # Increment by the interval
-
-        return tuple(result)
+        if n == 1:
+            return (first_execution,)
+        interval = self.interval
+        return tuple(first_execution + interval * i for i in range(n))
 
     def prev_many(self, n: int = 1, pivot: datetime | None = None) -> tuple[datetime, ...]:
         """Return the previous `n` execution times before the `pivot` time."""
@@ -159,40 +169,29 @@ class SchedulePeriodic(ScheduleEntry):
         if first_execution > pivot:
             first_execution -= timedelta(days=1)
 
-        # Calculate how many intervals have passed from first_execution to pivot
-        delta_since_start = (pivot - first_execution).total_seconds()
-        intervals_since_start = delta_since_start // self.interval.total_seconds()
-
-        # Compute the most recent execution time before the pivot
-        last_execution = first_execution + timedelta(seconds=intervals_since_start * self.interval.total_seconds())
+        # Step forward by the whole intervals that have passed from first_execution to the pivot
+        last_execution = first_execution + self.interval * ((pivot - first_execution) // self.interval)
 
         # Ensure last_execution is before the pivot
         if last_execution > pivot:
             last_execution -= self.interval
 
-        result = []
-        current_time = last_execution
-        for _ in range(n):
-            result.append(current_time)
-            current_time -= self.interval  # Decrement by interval
-
-        return tuple(result)
+        if n == 1:
+            return (last_execution,)
+        interval = self.interval
+        return tuple(last_execution - interval * i for i in range(n))
 
 
 class AliasGenerator:
     def __init__(self):
-        self.alias_counts = {}
+        self.alias_counts: defaultdict[str, int] = defaultdict(int)
 
     def generate_alias(self, alias: str) -> str:
-        if alias in self.alias_counts:
-            self.alias_counts[alias] += 1
-            return f"{alias}_{self.alias_counts[alias]}"
-        else:
-            self.alias_counts[alias] = 1
-            return alias
+        self.alias_counts[alias] = occurrence = self.alias_counts[alias] + 1
+        return alias if occurrence == 1 else f"{alias}_{occurrence}"
 
     def reset(self):
-        self.alias_counts = {}
+        self.alias_counts.clear()
 
 
 class SchedulerTask:
@@ -201,7 +200,7 @@ class SchedulerTask:
         schedule: ScheduleEntry,
         coro: Task,
         alias: str,
-        tags: set[str],
+        tags: frozenset[str],
         tz: tzinfo | None = None,
     ) -> None:
         self.schedule = schedule
@@ -210,17 +209,30 @@ class SchedulerTask:
         self.alias = alias
         self.tags = tags
         self.tz = tz
+        # Wrapped like so, coro will never raise error, except canceled error.
+        # The wrapper keeps no state between calls, so one instance serves every run
+        self._reliable = ReliableWrapper(
+            coro,
+            max_retries=3,
+            silence_exceptions=(Exception,),
+            always_raise_exceptions=(asyncio.CancelledError,),  # type: ignore
+        )
+        # Tasks are not modified after creation and are logged on every scheduling step
+        self._repr = self._make_repr()
 
-    def __repr__(self) -> str:
+    def _make_repr(self) -> str:
         s = (
             f"{self.__class__.__name__}(schedule={self.schedule!r}, coro={self.coro!r}, "
-            f"alias={self.alias!r}, tags={self.tags}"
+            f"alias={self.alias!r}, tags={set(self.tags)}"
         )
         if self.tz is not None:
             s += f", tz={self.tz}"
         s += ")"
         return s
 
+    def __repr__(self) -> str:
+        return self._repr
+
     def __eq__(self, value: object) -> bool:
         if not isinstance(value, self.__class__):
             raise TypeError(f"could not compare {self.__class__} and {value.__class__}")
@@ -232,61 +244,8 @@ class SchedulerTask:
             and self.tz == value.tz
         )
 
-    async def run(self, stop_event: asyncio.Event):
-        next_run = None
-        fetch_next_time = True
-
-        while not stop_event.is_set():
-            if fetch_next_time:
-                next_run = self.schedule.next()
-            fetch_next_time = True
-
-            if not next_run:
-                logger.debug("Task executed last time", task=self)
-                return
-
-            seconds_until_next_run = max(
-                (next_run - datetime.now(self.tz) + timedelta(milliseconds=1)).total_seconds(),
-                0,
-            )
-            with suppress(asyncio.TimeoutError):
-                await asyncio.wait_for(stop_event.wait(), timeout=seconds_until_next_run)
-                return
-
-            if datetime.now(self.tz) < next_run - timedelta(seconds=1.5):  # Some tolerance
-                logger.warning("Some task execution time drifting happens, please adjust your schedule")  # wat?
-                fetch_next_time = False
-                continue
-
-            stop_task = asyncio.create_task(stop_event.wait())
-            wrapped_task = asyncio.create_task(self.execute())  # type: ignore
-
-            done, pending = await asyncio.wait([stop_task, wrapped_task], return_when=asyncio.FIRST_COMPLETED)
-            for task in pending:
-                task.cancel()
-                try:
-                    await task  # Ensure is cancelled
-                except asyncio.CancelledError:
-                    if task is wrapped_task:
-                        logger.warning("Task cancelled due to stop_event trigger")
-
-            if not wrapped_task.cancelled():
-                # get the exception raised by a task
-                if exception := wrapped_task.exception():
-                    try:
-                        raise exception
-                    except Exception:
-                        logger.exception("Exception in the asyncio task", task=self)
-                        raise
-
     async def execute(self):
-        # Wrapped like so, coro will never raise error, except canceled error
-        wrapped = ReliableWrapper(
-            self.coro,
-            max_retries=3,
-            silence_exceptions=(Exception,),
-            always_raise_exceptions=(asyncio.CancelledError,),  # type: ignore
-        )
+        wrapped: Wrapper = self._reliable
         if next_next := self.schedule.next():
             # TODO: estimate avg execution time for task and use it as delta in run_until
             wrapped = TimeoutWrapper(wrapped, run_until=next_next - timedelta(milliseconds=10), tz=self.tz)
@@ -298,8 +257,20 @@ class Scheduler:
         self.tz = tz
         self.alias_generator = AliasGenerator()
 
-        self.pending_tasks: asyncio.Queue[SchedulerTask] = asyncio.Queue()
-        self._tasks: dict[asyncio.Task, SchedulerTask] = {}
+        # Handed over to the run loop, which registers them on its next pass
+        self._pending: list[SchedulerTask] = []
+        # Scheduled tasks by identity, in scheduling order
+        self._tasks: dict[int, SchedulerTask] = {}
+        # Upcoming runs as (timestamp, sequence, run time, task), so tasks themselves are never compared
+        self._heap: list[tuple[float, int, datetime, SchedulerTask]] = []
+        self._sequence = count()
+        # Executions in flight, and tasks without further runs waiting to be unscheduled
+        self._running: dict[asyncio.Task, SchedulerTask] = {}
+        self._finished: list[SchedulerTask] = []
+        # Executions reported finished by their done callback, so cleanup never scans the running ones
+        self._done: list[asyncio.Task] = []
+        # Set whenever the run loop has something new to look at, instead of polling
+        self._wakeup = asyncio.Event()
 
     def _make_alias(self, coro: Task, alias: str | None) -> str:
         alias = alias or coro.__name__
@@ -307,7 +278,37 @@ class Scheduler:
 
     def _schedule(self, task: SchedulerTask):
         logger.debug("task added to pending tasks", task=task)
-        self.pending_tasks.put_nowait(task)
+        self._pending.append(task)
+        self._wakeup.set()
+
+    def _wake(self, _: asyncio.Future) -> None:
+        self._wakeup.set()
+
+    def _on_execution_done(self, execution: asyncio.Task) -> None:
+        self._done.append(execution)
+        self._wakeup.set()
+
+    def _push(self, task: SchedulerTask, next_run: datetime):
+        heapq.heappush(self._heap, (next_run.timestamp(), next(self._sequence), next_run, task))
+
+    def _run_due_tasks(self, now: datetime, now_ts: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now_ts:
+            _, _, run_at, task = heapq.heappop(heap)
+            execution = asyncio.create_task(task.execute())
+            # Finished executions may be unscheduled, so they wake the run loop as well
+            execution.add_done_callback(self._on_execution_done)
+            self._running[execution] = task
+            # The pivot must be past the current run, periodic schedules return a run equal to the pivot
+            next_run = task.schedule.next(pivot=max(now, run_at + timedelta(milliseconds=1)))
+            if next_run is not None:
+                self._push(task, next_run)
+
+    def _time_until_next_run(self, now_ts: float) -> float | None:
+        if not self._heap:
+            return None
+        # Waking up slightly late guarantees the run is due
+        return max(self._heap[0][0] - now_ts + 0.001, 0)
 
     def periodic(
         self,
@@ -315,13 +316,13 @@ class Scheduler:
         interval: timedelta,
         start_at: time | None = None,
         alias: str | None = None,
-        tags: set[str] | None = None,
+        tags: AbstractSet[str] | None = None,
     ) -> SchedulerTask:
         task = SchedulerTask(
             schedule=SchedulePeriodic(interval=interval, start_at=start_at, tz=self.tz),
             coro=coro,
             alias=self._make_alias(coro, alias),
-            tags=tags or set(),
+            tags=frozenset(tags) if tags else _NO_TAGS,
             tz=self.tz,
         )
         self._schedule(task)
@@ -332,7 +333,7 @@ class Scheduler:
         coro: Task,
         run_at: time,
         alias: str | None = None,
-        tags: set[str] | None = None,
+        tags: AbstractSet[str] | None = None,
         shift_if_late: bool = False,
     ) -> SchedulerTask:
         # Current date and time
@@ -350,7 +351,7 @@ class Scheduler:
             schedule=ScheduleOnce(run_at=run_at_datetime, tz=self.tz),
             coro=coro,
             alias=self._make_alias(coro, alias),
-            tags=tags or set(),
+            tags=frozenset(tags) if tags else _NO_TAGS,
             tz=self.tz,
         )
         self._schedule(task)
@@ -364,36 +365,56 @@ class Scheduler:
         auto_unschedule: bool = False,
     ):
         logger.info("Starting scheduler")
+        loop = asyncio.get_running_loop()
+        stop_waiter = asyncio.ensure_future(stop_event.wait())
+        stop_waiter.add_done_callback(self._wake)
 
         while not stop_event.is_set():
-            while not self.pending_tasks.empty():
-                try:
-                    scheduler_task = await asyncio.wait_for(self.pending_tasks.get(), 1.0)
-                except asyncio.TimeoutError:
-                    continue
+            self._wakeup.clear()
+            # One clock reading per pass, the sleep itself is timed by the loop's monotonic clock
+            now = datetime.now(self.tz)
+            now_ts = now.timestamp()
 
-                self.pending_tasks.task_done()
+            pending, self._pending = self._pending, []
+            for scheduler_task in pending:
                 logger.debug("Scheduled a task", task=scheduler_task)
-                aio_task = asyncio.create_task(scheduler_task.run(stop_event))
-                self._tasks[aio_task] = scheduler_task
+                self._tasks[id(scheduler_task)] = scheduler_task
+                next_run = scheduler_task.schedule.next(pivot=now)
+                if next_run is None:
+                    logger.debug("Task executed last time", task=scheduler_task)
+                    self._finished.append(scheduler_task)
+                else:
+                    self._push(scheduler_task, next_run)
+
+            self._run_due_tasks(now, now_ts)
+            self.cleanup_tasks(remove=auto_unschedule)
 
             if exit_on_empty_schedule and not self._tasks:
                 break
 
-            self.cleanup_tasks(remove=auto_unschedule)
-
-            with suppress(asyncio.TimeoutError):
-                await asyncio.wait_for(stop_event.wait(), 1.0)
-                logger.debug("Stop signal received")
-                break
+            # Sleep until the closest run, unless new tasks, finished executions or a stop come first.
+            # A loop timer sets the same wakeup event, so no timeout task is created per pass
+            delay = self._time_until_next_run(now_ts)
+            timer = loop.call_later(delay, self._wakeup.set) if delay is not None else None
+            try:
+                await self._wakeup.wait()
+            finally:
+                if timer is not None:
+                    timer.cancel()
+        else:
+            logger.debug("Stop signal received")
 
+        stop_waiter.cancel()
         logger.info("Terminating scheduler")
         await self._shutdown_tasks()
         logger.warning("Scheduler terminated")
 
     def cleanup_tasks(self, remove: bool = True):
-        for aio_task, scheduler_task in self._tasks.copy().items():
-            if not aio_task.done():
+        done, self._done = self._done, []
+        now = datetime.now(self.tz) if done else None
+        for aio_task in done:
+            scheduler_task = self._running.pop(aio_task, None)
+            if scheduler_task is None:
                 continue
             if not aio_task.cancelled():
                 # get the exception raised by a task
@@ -403,32 +424,28 @@ class Scheduler:
                     except Exception:
                         logger.exception("Exception in the managed task:", task=scheduler_task)
                         raise
-            if remove:
-                logger.debug("Task unscheduled", task=scheduler_task, aio_task=aio_task)
-                del self._tasks[aio_task]
+            if scheduler_task.schedule.next(pivot=now) is None:
+                logger.debug("Task executed last time", task=scheduler_task)
+                self._finished.append(scheduler_task)
+
+        if remove:
+            for scheduler_task in self._finished:
+                logger.debug("Task unscheduled", task=scheduler_task)
+                self._tasks.pop(id(scheduler_task), None)
+        self._finished.clear()
 
     async def _shutdown_tasks(self):
-        # If tasks not exited gracefully, terminate them by cancelling
+        # If executions are still running, terminate them by cancelling
         logger.debug("Shutting down tasks")
-        active_tasks = self._tasks.copy()
-
-        tasks = tuple(active_tasks.items())
+        tasks = tuple(self._running.items())
 
         for aio_task, scheduler_task in tasks:
-            # TODO: WHAT TO DO WITH IT??
-            # if asyncio.current_task() is aio_task:
-            #     logger.warning(f"Current task {aio_task.get_name()} tries to cancel itself")
-            #     continue
-
             if not aio_task.done():
                 aio_task.cancel()
             else:
                 logger.debug(f"Task {aio_task.get_name()} exited", task=scheduler_task)
 
         for aio_task, scheduler_task in tasks:
-            # TODO: WHAT TO DO WITH IT??
-            # if asyncio.current_task() is aio_task:
-            #     continue
             if aio_task.done():
                 continue
 
@@ -437,24 +454,35 @@ class Scheduler:
                 logger.debug(f"Task {aio_task.get_name()} exited", task=scheduler_task)
 
             except asyncio.CancelledError:
-                logger.debug(f"Task {aio_task.get_name()} canceled", task=scheduler_task)
-
-            # except asyncio.TimeoutError:
-            #     logger.warning(
-            #         f"Task {aio_task.get_name()!r} not canceled, but timeouted - deadlock?", task=scheduler_task
-            #     )
+                logger.warning("Task cancelled due to stop_event trigger", task=scheduler_task)
 
+        self._running.clear()
+        self._done.clear()
         logger.debug("All tasks stopped")
 
     async def reset(self):
         logger.debug("Performing scheduler clean")
-        await self._shutdown_tasks()
+        # Executions in flight are left to finish, the caller itself may be one of them
+        self._heap.clear()
         self._tasks.clear()
+        self._finished.clear()
         self.alias_generator.reset()
+        self._wakeup.set()
         logger.debug("Scheduler cleared")
 
+    def get_tasks(self) -> tuple[SchedulerTask, ...]:
+        # Unordered, for lookups which don't need the (costly) sorting of get_schedule
+        return tuple(self._tasks.values())
+
+    def _next_runs(self, pivot: datetime) -> list[tuple[datetime | None, SchedulerTask]]:
+        """Tasks with their next run after the pivot, ordered like their schedules, finished tasks first."""
+        runs = [(task.schedule.next(pivot=pivot), task) for task in self._tasks.values()]
+        # Each next run is computed once, sorting by ScheduleEntry would recompute it per comparison
+        runs.sort(key=_next_run_key)
+        return runs
+
     def get_schedule(self) -> tuple[SchedulerTask, ...]:
-        return tuple(sorted(self._tasks.values(), key=lambda t: t.schedule))
+        return tuple(task for _, task in self._next_runs(datetime.now(self.tz)))
 
     def __str__(self) -> str:
         if not self._tasks:
@@ -485,18 +513,19 @@ class Scheduler:
             "Previous Run",
         )  # Add Previous Run column name
 
-        # Create format string for each column
-        form = [f"{{{idx}:{align}{width}}}" for idx, (align, width) in enumerate(zip(c_align, c_width))]
-        fstring = " ".join(form) + "\n"
+        # Create a padding function for each column, applied to every row
+        pads = tuple(_make_padder(align, width) for align, width in zip(c_align, c_width))
+
+        def format_row(*cells: str) -> str:
+            return " ".join([pad(cell) for pad, cell in zip(pads, cells)]) + "\n"
 
         # Header row
-        job_table = fstring.format(*c_name)
-        job_table += fstring.format(*("-" * width for width in c_width))
+        rows = [format_row(*c_name), format_row(*("-" * width for width in c_width))]
 
-        # Job rows
-        tasks = sorted(self._tasks.values(), key=lambda t: t.schedule)
+        # Job rows, all relative to a single point in time
+        now = datetime.now(self.tz)
 
-        for task in tasks:
+        for next_run, task in self._next_runs(now):
             # Determine task type (once/periodic)
             task_type = "Periodic" if isinstance(task.schedule, SchedulePeriodic) else "Once"
 
@@ -507,9 +536,8 @@ class Scheduler:
             tags_str = str_cutoff(",".join(task.tags), max_tags_length) if task.tags else ""
 
             # Calculate time until next execution
-            next_run = task.schedule.next()
             if next_run is not None:
-                time_left = next_run - datetime.now(self.tz)
+                time_left = next_run - now
                 time_left_str = str(time_left)  # .split(".")[0]  # remove microseconds for better readability
                 next_run_str = next_run.strftime("%Y-%m-%d %H:%M:%S %Z")
             else:
@@ -517,13 +545,13 @@ class Scheduler:
                 next_run_str = "N/A"
 
             # Retrieve the previous run
-            prev_run = task.schedule.prev()
+            prev_run = task.schedule.prev(pivot=now)
             if prev_run is not None:
                 prev_run_str = prev_run.strftime("%Y-%m-%d %H:%M:%S %Z")
             else:
                 prev_run_str = "N/A"
 
             # Add the task details to the table
-            job_table += fstring.format(task_type, alias, tags_str, time_left_str, next_run_str, prev_run_str)
+            rows.append(format_row(task_type, alias, tags_str, time_left_str, next_run_str, prev_run_str))
 
-        return job_table
+        return "".join(rows)
@@ -1,3 +1,4 @@
+import asyncio
 import aiosqlite
 import pickle
 import hashlib
@@ -27,6 +28,8 @@ class SqliteKeyValueStorage(IKeyValueStorage):
     def __init__(self, path: str):
         self._db = None
         self._path = path
+        # Tables are created and verified once per name, concurrent callers share the pending creation
+        self._collections: dict[str, asyncio.Future["SqliteKeyValueCollection"]] = {}
 
     @classmethod
     async def open(cls, path: str):
@@ -43,6 +46,7 @@ class SqliteKeyValueStorage(IKeyValueStorage):
             await self._db.commit()  # Ensure all transactions are committed.
             await self._db.close()
             self._db = None
+        self._collections.clear()
 
     async def __aenter__(self):
         if self._db is None:
@@ -62,6 +66,19 @@ class SqliteKeyValueStorage(IKeyValueStorage):
         return self.db  # Use the property to leverage the built-in error handling
 
     async def create_collection(self, name: str) -> "SqliteKeyValueCollection":
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = asyncio.ensure_future(self._create_collection(name))
+        try:
+            # Shielded, so a cancelled caller does not cancel the creation for the others
+            return await asyncio.shield(collection)
+        except Exception:
+            # Let the next caller retry a failed creation
+            if self._collections.get(name) is collection:
+                del self._collections[name]
+            raise
+
+    async def _create_collection(self, name: str) -> "SqliteKeyValueCollection":
         table_name = _table_name(name)
         await self.db.execute(
             f"""
@@ -82,6 +99,7 @@ class SqliteKeyValueStorage(IKeyValueStorage):
         return SqliteKeyValueCollection(self.get_db_connection, name)
 
     async def delete_collection(self, name: str) -> bool:
+        self._collections.pop(name, None)
         table_name = _table_name(name)
         try:
             await self.db.execute(f"DROP TABLE IF EXISTS {table_name}")
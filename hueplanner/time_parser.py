@@ -2,57 +2,136 @@ from __future__ import annotations
 
 import re
 from datetime import datetime, timedelta, tzinfo
-
-import pytimeparse2 as pytimeparse
+from functools import lru_cache
+from typing import NamedTuple
 
 from hueplanner.storage.interface import IKeyValueCollection
 
 
+_VARIABLE_RE = re.compile(r"@(\w+)")
+_EXACT_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})")
+_MODIFIER_RE = re.compile(r"([-+])\s*(.*)")
+
+
+_DURATION_UNITS = {"d": 86400, "h": 3600, "m": 60, "s": 1, "ms": 0.001}
+
+
+def _scan_duration(value: str) -> float | None:
+    """Single pass over compact durations like '1h30m' or '500ms', None for anything else."""
+    total = 0.0
+    previous_unit = float("inf")
+    i, n = 0, len(value)
+    if n == 0:
+        return None
+    while i < n:
+        start = i
+        while i < n and "0" <= value[i] <= "9":
+            i += 1
+        if i == start:
+            return None
+        amount = int(value[start:i])
+        start = i
+        while i < n and "a" <= value[i] <= "z":
+            i += 1
+        unit = _DURATION_UNITS.get(value[start:i])
+        # Units must come largest first and only once, as pytimeparse expects
+        if unit is None or unit >= previous_unit:
+            return None
+        previous_unit = unit
+        total += amount * unit
+    return total
+
+
+def parse_duration(value: str) -> float | None:
+    """Parse a duration to seconds, None if it is not recognized."""
+    seconds = _scan_duration(value)
+    if seconds is None:
+        # Imported on first use, compact durations never need it
+        import pytimeparse2 as pytimeparse
+
+        seconds = pytimeparse.parse(value)
+    return seconds
+
+
+class TimeExpression(NamedTuple):
+    variable: str | None = None
+    hours: int | None = None
+    minutes: int | None = None
+    offset: timedelta | None = None
+    # Unparseable modifier, reported only after the base time is resolved
+    invalid_duration: str | None = None
+
+
+@lru_cache(maxsize=256)
+def parse_time_expression(input_time: str) -> TimeExpression:
+    """Parse the static structure of a time expression, which only depends on the string itself."""
+    variable = hours = minutes = offset = invalid_duration = None
+
+    # Match @variable pattern
+    variable_match = _VARIABLE_RE.match(input_time)
+    if variable_match:
+        variable = variable_match.group(1)
+    else:
+        # Match XX:XX pattern for exact time (e.g., 13:00)
+        time_match = _EXACT_TIME_RE.match(input_time)
+        if time_match:
+            hours, minutes = map(int, time_match.groups())
+
+    # Now, extract and parse the modifier (if any)
+    modifier_match = _MODIFIER_RE.search(input_time)
+    if modifier_match:
+        sign, duration_str = modifier_match.groups()
+        duration = parse_duration(duration_str.strip())
+        if duration is None:
+            invalid_duration = duration_str
+        else:
+            offset = timedelta(seconds=-duration if sign == "-" else duration)
+
+    return TimeExpression(variable, hours, minutes, offset, invalid_duration)
+
+
+def _apply_offset(expression: TimeExpression, base_time: datetime) -> datetime:
+    if expression.invalid_duration is not None:
+        raise ValueError(f"Could not parse duration '{expression.invalid_duration}'")
+    if expression.offset is not None:
+        # Apply the parsed timedelta to the base time
+        return base_time + expression.offset
+    return base_time
+
+
+def parse_static_time(input_time: str, tz: tzinfo) -> datetime:
+    """Resolve a time expression that references no variables, which needs no lookups."""
+    expression = parse_time_expression(input_time)
+    if expression.variable is not None or expression.hours is None:
+        raise ValueError(f"Input time '{input_time}' is not recognized as a valid time format.")
+    base_time = datetime.now(tz).replace(hour=expression.hours, minute=expression.minutes, second=0, microsecond=0)
+    return _apply_offset(expression, base_time)
+
+
 class TimeParser:
     def __init__(self, tz: tzinfo, variables_collections: list[IKeyValueCollection]):
         self.tz = tz
         self.variables_collections = variables_collections
 
     async def parse(self, input_time: str):
-        # Match @variable pattern
-        variable_match = re.match(r"@(\w+)", input_time)
-        base_time = None
+        # Expression structure is cached, only the base time is resolved on each call
+        expression = parse_time_expression(input_time)
+        var_name = expression.variable
+        if var_name is None:
+            return parse_static_time(input_time, self.tz)
 
-        if variable_match:
-            var_name = variable_match.group(1)
-            if var_name == "now":  # Special case for @now
-                base_time = datetime.now(tz=self.tz)
-            else:
-                for collection in self.variables_collections:
-                    base_time = await collection.get(var_name)
-                    if base_time is not None:
-                        break
-            if base_time is None:
-                raise ValueError(f"Time variable '@{var_name}' is not defined.")
+        base_time = None
+        if var_name == "now":  # Special case for @now
+            base_time = datetime.now(tz=self.tz)
         else:
-            # Match XX:XX pattern for exact time (e.g., 13:00)
-            time_match = re.match(r"(\d{1,2}):(\d{2})", input_time)
-            if time_match:
-                hours, minutes = map(int, time_match.groups())
-                base_time = datetime.now(self.tz).replace(hour=hours, minute=minutes, second=0, microsecond=0)
-
+            for collection in self.variables_collections:
+                base_time = await collection.get(var_name)
+                if base_time is not None:
+                    break
         if base_time is None:
-            raise ValueError(f"Input time '{input_time}' is not recognized as a valid time format.")
-
-        # Now, extract and parse the modifier (if any)
-        modifier_match = re.search(r"([-+])\s*(.*)", input_time)
-        if modifier_match:
-            sign, duration_str = modifier_match.groups()
-            duration = pytimeparse.parse(duration_str.strip())
-            if duration is None:
-                raise ValueError(f"Could not parse duration '{duration_str}'")
-
-            # Apply the parsed timedelta to the base time
-            if sign == "-":
-                duration = -duration
-            return base_time + timedelta(seconds=duration)
-
-        return base_time
+            raise ValueError(f"Time variable '@{var_name}' is not defined.")
+
+        return _apply_offset(expression, base_time)
 
 
 # Mocked IKeyValueCollection for testing
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from hueplanner.planner.actions.store_scene import PlanActionStoreSceneById, PlanActionStoreSceneByName
+
+
+def make_scene(scene_id: str, name: str, group_rid: str, group_rtype: str, id_v1: str | None = None):
+    return SimpleNamespace(
+        id=scene_id,
+        id_v1=id_v1,
+        metadata=SimpleNamespace(name=name),
+        group=SimpleNamespace(rid=group_rid, rtype=group_rtype),
+    )
+
+
+# v2 group resources of rooms and zones, both map to a v1 group id
+GROUPS = {
+    "room-rid": SimpleNamespace(id="room-rid", id_v1="/groups/3"),
+    "zone-rid": SimpleNamespace(id="zone-rid", id_v1="/groups/12"),
+    "no-v1-rid": SimpleNamespace(id="no-v1-rid", id_v1=None),
+    "odd-rid": SimpleNamespace(id="odd-rid", id_v1="/groups/abc"),
+}
+
+SCENES = [
+    make_scene("room-relax", "Relax", "room-rid", "room", id_v1="/scenes/aaa"),
+    make_scene("zone-relax", "Relax", "zone-rid", "zone", id_v1="/scenes/bbb"),
+    make_scene("room-bright", "Bright", "room-rid", "room", id_v1="/scenes/ccc"),
+    make_scene("no-v1-relax", "Relax", "no-v1-rid", "zone"),
+    make_scene("odd-relax", "Relax", "odd-rid", "zone"),
+]
+
+
+def make_hue_v2():
+    return SimpleNamespace(get_zone=AsyncMock(side_effect=lambda rid: GROUPS[rid]))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name, group, expected_id",
+    [
+        ("Relax", 3, "room-relax"),
+        ("Relax", 12, "zone-relax"),
+        ("Bright", 3, "room-bright"),
+        ("Bright", 12, None),
+        ("Relax", 99, None),
+        ("Missing", 3, None),
+    ],
+)
+async def test_find_scene_v2_by_name_in_group(name, group, expected_id):
+    hue_v2 = make_hue_v2()
+    action = PlanActionStoreSceneByName(name=name, group=group, db_key="key")
+
+    scene = await action.find_scene_v2(hue_v2, SCENES)
+
+    assert (scene.id if scene else None) == expected_id
+    # Groups of name-matched scenes are requested once each
+    requested = [call.args[0] for call in hue_v2.get_zone.await_args_list]
+    assert sorted(requested) == sorted({s.group.rid for s in SCENES if s.metadata.name == name})
+
+
+@pytest.mark.asyncio
+async def test_find_scene_v2_by_name_without_group():
+    hue_v2 = make_hue_v2()
+    action = PlanActionStoreSceneByName(name="Relax", db_key="key")
+
+    scene = await action.find_scene_v2(hue_v2, SCENES)
+
+    assert scene.id == "room-relax"
+    hue_v2.get_zone.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scene_id, expected_id", [("bbb", "zone-relax"), ("ccc", "room-bright"), ("zzz", None)])
+async def test_find_scene_v2_by_id(scene_id, expected_id):
+    action = PlanActionStoreSceneById(id=scene_id, db_key="key")
+
+    scene = await action.find_scene_v2(make_hue_v2(), SCENES)
+
+    assert (scene.id if scene else None) == expected_id
@@ -0,0 +1,215 @@
+import asyncio
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+
+from hueplanner.scheduler import Scheduler
+
+tz = timezone.utc
+
+# Schedules are checked for order and for not running early. Upper bounds on lateness are kept
+# an order of magnitude above the delays used, so a loaded machine does not fail the tests.
+SLACK = timedelta(seconds=1)
+
+
+@pytest.fixture(autouse=True)
+def not_around_midnight():
+    # Run times are given as times of day, which wrap around at midnight
+    now = datetime.now(tz)
+    if now.time() >= time(23, 59, 50) or now.time() < time(0, 0, 10):
+        pytest.skip("Times of day wrap around at midnight")
+
+
+def in_seconds(seconds: float):
+    return (datetime.now(tz) + timedelta(seconds=seconds)).timetz()
+
+
+def make_recorder(runs: list, name: str, duration: float = 0):
+    async def record():
+        runs.append((name, datetime.now(tz)))
+        await asyncio.sleep(duration)
+
+    record.__name__ = name
+    return record
+
+
+async def run_for(scheduler: Scheduler, seconds: float, **kwargs):
+    stop_event = asyncio.Event()
+    runner = asyncio.create_task(scheduler.run(stop_event, **kwargs))
+    await asyncio.sleep(seconds)
+    stop_event.set()
+    await asyncio.wait_for(runner, 5)
+
+
+@pytest.mark.asyncio
+async def test_once_task_runs_at_its_time():
+    runs: list = []
+    scheduler = Scheduler(tz)
+    run_at = datetime.now(tz) + timedelta(seconds=0.2)
+    scheduler.once(make_recorder(runs, "once"), run_at.timetz())
+
+    await run_for(scheduler, 0.6)
+
+    assert [name for name, _ in runs] == ["once"]
+    # Runs are never started early
+    assert run_at <= runs[0][1] < run_at + SLACK
+
+
+@pytest.mark.asyncio
+async def test_once_task_in_the_past_never_runs():
+    runs: list = []
+    scheduler = Scheduler(tz)
+    scheduler.once(make_recorder(runs, "past"), in_seconds(-1))
+
+    await run_for(scheduler, 0.2)
+
+    assert runs == []
+
+
+@pytest.mark.asyncio
+async def test_periodic_task_runs_once_per_interval():
+    runs: list = []
+    scheduler = Scheduler(tz)
+    interval = timedelta(seconds=0.2)
+    start_at = datetime.now(tz) + timedelta(seconds=0.1)
+    scheduler.periodic(make_recorder(runs, "periodic"), interval, start_at=start_at.timetz())
+
+    await run_for(scheduler, 1.0)
+
+    assert len(runs) >= 2
+    # Every run falls into its own interval after the start, so runs are neither early nor repeated
+    slots = [(ran_at - start_at) // interval for _, ran_at in runs]
+    assert all(ran_at >= start_at for _, ran_at in runs)
+    assert slots == sorted(set(slots))
+
+
+@pytest.mark.asyncio
+async def test_task_added_while_running_is_picked_up():
+    runs: list = []
+    scheduler = Scheduler(tz)
+    stop_event = asyncio.Event()
+    runner = asyncio.create_task(scheduler.run(stop_event))
+    await asyncio.sleep(0.1)
+
+    # The loop is idle with nothing scheduled, a new task must wake it up
+    scheduler.once(make_recorder(runs, "late"), in_seconds(0.1))
+    await asyncio.sleep(0.6)
+    stop_event.set()
+    await asyncio.wait_for(runner, 5)
+
+    assert [name for name, _ in runs] == ["late"]
+
+
+@pytest.mark.asyncio
+async def test_auto_unschedule_removes_finished_tasks():
+    runs: list = []
+    scheduler = Scheduler(tz)
+    scheduler.once(make_recorder(runs, "once"), in_seconds(0.1))
+    scheduler.periodic(make_recorder(runs, "periodic"), timedelta(seconds=30), start_at=in_seconds(10))
+
+    await run_for(scheduler, 0.6, auto_unschedule=True)
+
+    assert [name for name, _ in runs] == ["once"]
+    assert [task.alias for task in scheduler.get_tasks()] == ["periodic"]
+
+
+@pytest.mark.asyncio
+async def test_finished_tasks_are_kept_without_auto_unschedule():
+    runs: list = []
+    scheduler = Scheduler(tz)
+    scheduler.once(make_recorder(runs, "once"), in_seconds(0.1))
+    scheduler.once(make_recorder(runs, "past"), in_seconds(-1))
+
+    await run_for(scheduler, 0.6)
+
+    assert [name for name, _ in runs] == ["once"]
+    assert {task.alias for task in scheduler.get_tasks()} == {"once", "past"}
+
+
+@pytest.mark.asyncio
+async def test_exit_on_empty_schedule_waits_for_running_tasks():
+    runs: list = []
+    scheduler = Scheduler(tz)
+    scheduler.once(make_recorder(runs, "short"), in_seconds(0.1))
+    scheduler.once(make_recorder(runs, "long", duration=0.3), in_seconds(0.1))
+
+    started = datetime.now(tz)
+    await asyncio.wait_for(
+        scheduler.run(asyncio.Event(), exit_on_empty_schedule=True, auto_unschedule=True),
+        5,
+    )
+
+    assert sorted(name for name, _ in runs) == ["long", "short"]
+    # The long task is unscheduled only after it finished
+    assert datetime.now(tz) - started >= timedelta(seconds=0.4)
+    assert scheduler.get_tasks() == ()
+
+
+@pytest.mark.asyncio
+async def test_reset_drops_scheduled_tasks():
+    runs: list = []
+    scheduler = Scheduler(tz)
+    stop_event = asyncio.Event()
+    scheduler.once(make_recorder(runs, "dropped"), in_seconds(0.3), alias="task")
+    scheduler.periodic(make_recorder(runs, "dropped"), timedelta(seconds=30), start_at=in_seconds(0.3))
+    runner = asyncio.create_task(scheduler.run(stop_event))
+    await asyncio.sleep(0.05)
+
+    await scheduler.reset()
+    assert scheduler.get_tasks() == ()
+    scheduler.once(make_recorder(runs, "kept"), in_seconds(0.1), alias="task")
+
+    await asyncio.sleep(0.8)
+    stop_event.set()
+    await asyncio.wait_for(runner, 5)
+
+    assert [name for name, _ in runs] == ["kept"]
+    # Aliases are generated from scratch after a reset
+    assert [task.alias for task in scheduler.get_tasks()] == ["task"]
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_running_tasks():
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def hang():
+        started.set()
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    scheduler = Scheduler(tz)
+    stop_event = asyncio.Event()
+    scheduler.once(hang, in_seconds(0.05))
+    runner = asyncio.create_task(scheduler.run(stop_event))
+    await asyncio.wait_for(started.wait(), 5)
+
+    stop_event.set()
+    stopping = datetime.now(tz)
+    await asyncio.wait_for(runner, 10)
+
+    assert cancelled.is_set()
+    # The running task is cancelled instead of being waited for
+    assert datetime.now(tz) - stopping < 5 * SLACK
+
+
+@pytest.mark.asyncio
+async def test_off_schedule_run_of_once_task_is_bounded_by_its_run():
+    finished = asyncio.Event()
+
+    async def work():
+        await asyncio.sleep(30)
+        finished.set()
+
+    scheduler = Scheduler(tz)
+    task = scheduler.once(work, in_seconds(0.3))
+
+    # Executed ahead of its time, as PlanActionRunClosestSchedule does, the run is cut off at the scheduled run
+    started = datetime.now(tz)
+    await asyncio.wait_for(task.execute(), 10)
+
+    assert not finished.is_set()
+    assert datetime.now(tz) - started < 5 * SLACK
@@ -0,0 +1,57 @@
+import pytest
+import pytimeparse2
+
+from hueplanner.time_parser import _scan_duration, parse_duration
+
+# Compact durations, handled by the scanner itself
+COMPACT_DURATIONS = [
+    "1h",
+    "30m",
+    "45s",
+    "2d",
+    "500ms",
+    "10ms",
+    "0s",
+    "01m",
+    "90m",
+    "1h30m",
+    "1m30s",
+    "1d2h3m4s",
+    "1h500ms",
+    "1d1ms",
+]
+
+# Everything else is left to pytimeparse, including the invalid inputs it rejects
+FALLBACK_DURATIONS = [
+    "1.5h",
+    "1 hour",
+    "2 days",
+    "1h 30m",
+    "1H",
+    "5mins",
+    "1w",
+    "3 weeks",
+    "90",
+    "1:30",
+    "00:01:30",
+    "1m1h",
+    "1s1d",
+    "1h1h",
+    "1d2d",
+    "1hh",
+    "m",
+    "abc",
+    "",
+]
+
+
+@pytest.mark.parametrize("value", COMPACT_DURATIONS)
+def test_compact_durations_are_scanned(value):
+    assert _scan_duration(value) is not None
+    assert parse_duration(value) == pytimeparse2.parse(value)
+
+
+@pytest.mark.parametrize("value", FALLBACK_DURATIONS)
+def test_other_durations_fall_back_to_pytimeparse(value):
+    assert _scan_duration(value) is None
+    assert parse_duration(value) == pytimeparse2.parse(value)
@@ -0,0 +1,78 @@
+import pytest
+
+from hueplanner.hue.v2.models import HueEvent
+from hueplanner.planner.triggers.hue_events import PlanTriggerConnectivity, PlanTriggerOnHueButtonEvent
+
+
+def make_event(*items: dict) -> HueEvent:
+    # Items are split over two stream events, as the bridge may batch them
+    half = len(items) // 2
+    return HueEvent(id="event", data=[{"data": list(items[:half])}, {"data": list(items[half:])}])
+
+
+def button(resource_id: str, action: str) -> dict:
+    return {"type": "button", "id": resource_id, "button": {"button_report": {"event": action}}}
+
+
+def connectivity(device_id: str, status: str) -> dict:
+    return {"type": "zigbee_connectivity", "id": device_id, "status": status}
+
+
+def light(light_id: str) -> dict:
+    return {"type": "light", "id": light_id, "on": {"on": True}}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "items, expected",
+    [
+        ((button("btn", "short_release"),), True),
+        ((light("lamp"), button("other", "initial_press"), button("btn", "short_release")), True),
+        ((button("btn", "long_press"),), False),
+        ((button("other", "short_release"),), False),
+        ((light("btn"),), False),
+        ((), False),
+    ],
+)
+async def test_button_event_check(items, expected):
+    check = PlanTriggerOnHueButtonEvent(resource_id="btn", action="short_release")._make_check()
+    assert await check(make_event(*items)) is expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "items, expected",
+    [
+        ((connectivity("dev", "connectivity_issue"),), True),
+        ((light("lamp"), connectivity("dev", "connectivity_issue")), True),
+        ((connectivity("dev", "connected"),), False),
+        # Without an id only the first connectivity item of the batch is inspected
+        ((connectivity("dev", "connected"), connectivity("other", "connectivity_issue")), False),
+        ((light("lamp"),), False),
+    ],
+)
+async def test_connectivity_check_without_id(items, expected):
+    check = PlanTriggerConnectivity(status="connectivity_issue")._make_check()
+    assert await check(make_event(*items)) is expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "items, expected",
+    [
+        ((connectivity("dev", "connectivity_issue"),), True),
+        # Any item for the device matches, not only the first connectivity item of the batch
+        ((connectivity("other", "connected"), connectivity("dev", "connectivity_issue")), True),
+        ((connectivity("dev", "connected"),), False),
+        ((connectivity("other", "connectivity_issue"),), False),
+        ((light("dev"),), False),
+    ],
+)
+async def test_connectivity_check_with_id(items, expected):
+    check = PlanTriggerConnectivity(status="connectivity_issue", id="dev")._make_check()
+    assert await check(make_event(*items)) is expected
+
+
+def test_button_event_requires_fields():
+    with pytest.raises(ValueError):
+        PlanTriggerOnHueButtonEvent(resource_id="", action="short_release")
@@ -0,0 +1,52 @@
+from datetime import datetime, time, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from hueplanner.planner.triggers.schedule import PlanTriggerOnce, PlanTriggerPeriodic
+from hueplanner.storage.memory import InMemoryKeyValueStorage
+
+tz = timezone.utc
+
+
+async def noop():
+    pass
+
+
+@pytest.mark.asyncio
+async def test_once_trigger_reads_variables_from_recreated_collection():
+    storage = InMemoryKeyValueStorage("")
+    variables = await storage.create_collection("variables")
+    await variables.set("dawn", datetime(2024, 1, 1, 6, 0, tzinfo=tz))
+    trigger = PlanTriggerOnce(time="@dawn", variables_db=["variables"])
+
+    scheduler = MagicMock()
+    await trigger.apply_trigger(noop, scheduler, storage, tz)
+    assert scheduler.once.call_args.kwargs["run_at"] == time(6, 0, tzinfo=tz)
+
+    # A collection deleted and created again must be read, not the one seen by the first application
+    await storage.delete_collection("variables")
+    variables = await storage.create_collection("variables")
+    await variables.set("dawn", datetime(2024, 1, 1, 7, 30, tzinfo=tz))
+
+    await trigger.apply_trigger(noop, scheduler, storage, tz)
+    assert scheduler.once.call_args.kwargs["run_at"] == time(7, 30, tzinfo=tz)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "start_at, alias, expected_alias",
+    [
+        (None, None, "each 0:15:00"),
+        ("12:00", None, "each 0:15:00 since 12:00"),
+        (None, "custom", "custom"),
+    ],
+)
+async def test_periodic_trigger_default_alias(start_at, alias, expected_alias):
+    trigger = PlanTriggerPeriodic(interval="15m", start_at=start_at, alias=alias)
+
+    scheduler = MagicMock()
+    await trigger.apply_trigger(noop, scheduler, InMemoryKeyValueStorage(""), tz)
+
+    assert scheduler.periodic.call_args.kwargs["alias"] == expected_alias
+    assert scheduler.periodic.call_args.kwargs["interval"] == timedelta(minutes=15)